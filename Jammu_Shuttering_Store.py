@@ -1,4 +1,6 @@
+import io
 import random
+import re
 import sys
 import os
 import json
@@ -10,15 +12,52 @@ from tkinter import messagebox, ttk
 import customtkinter as ctk
 import pyautogui
 from tkcalendar import Calendar
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from bisect import insort
+from functools import lru_cache
+from operator import itemgetter
+from PIL import Image, ImageFilter
 import qrcode
 import fitz  # PyMuPDF
+import numpy as np
 from fpdf import FPDF
 import subprocess
 from fpdf.enums import XPos, YPos
 
+# Bills are saved as Rental_Bill_<customer>_<YYYY-MM-DD>.pdf; other PDFs use <prefix>_<name>.pdf
+PDF_CUSTOMER_RE = re.compile(
+    r"^(?:Rental_Bill_(.+)_\d{4}-\d{2}-\d{2}|[^_]*_([^_]+?))(?:_.*)?\.pdf$", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=128)
+def upi_qr_png(payload):
+    """Render a UPI payment QR code to PNG bytes, cached per payload string"""
+    buffer = io.BytesIO()
+    qrcode.make(payload).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# (divisor, suffix) indexed by size_bytes.bit_length() // 10
+FILE_SIZE_UNITS = ((1, "B"), (1024, "KB"), (1024 * 1024, "MB"), (1024 * 1024 * 1024, "GB"))
+
+
+@lru_cache(maxsize=1024)
+def format_file_size(size_bytes):
+    """Convert a byte count to a human-readable size, cached since PDFs of one template share sizes"""
+    unit = min(max(0, (size_bytes.bit_length() - 1) // 10), len(FILE_SIZE_UNITS) - 1)
+    if unit == 0:
+        return f"{size_bytes} B"
+    divisor, suffix = FILE_SIZE_UNITS[unit]
+    return f"{size_bytes / divisor:.1f} {suffix}"
+
 
 class RentalBillApp(ctk.CTk):
+    # Fixed 80mm thermal-printer receipt layout (column widths in mm)
+    RECEIPT_INFO_COLUMNS = (25, 45)
+    RECEIPT_TABLE_COLUMNS = (30, 40)
+    HAVE_CODE39 = hasattr(FPDF, "code39")
+
     def __init__(self):
         super().__init__()
         self._init_variables()
@@ -78,6 +117,7 @@ class RentalBillApp(ctk.CTk):
         # Data storage
         self.items = []
         self.transactions = []
+        self._pdf_dir_cache = {}  # folder -> (folder mtime_ns, list of PDF metadata)
 
         # Load settings
         self.load_settings()
@@ -784,16 +824,12 @@ class RentalBillApp(ctk.CTk):
                 # Find the item's rent
                 new_rent = next((item[1] for item in self.items if item[0] == new_item), None)
 
-                # Update transaction
-                self.transactions[index] = (new_date, new_item, new_qty, new_rent)
+                # Update transaction, keeping the list in date order
+                del self.transactions[index]
+                insort(self.transactions, (new_date, new_item, new_qty, new_rent), key=itemgetter(0))
 
                 # Update treeview
-                self.trans_tree.item(selected[0], values=(
-                    str(new_date),
-                    new_item,
-                    abs(new_qty),
-                    action_var.get()
-                ))
+                self.refresh_transaction_tree()
 
                 edit_window.destroy()
 
@@ -1588,8 +1624,7 @@ class RentalBillApp(ctk.CTk):
 
             item_rent = next((item[1] for item in self.items if item[0] == item_name), None)
 
-            self.transactions.append((date, item_name, qty, item_rent))
-            self.transactions.sort(key=lambda x: x[0])  # Keep transactions sorted
+            insort(self.transactions, (date, item_name, qty, item_rent), key=itemgetter(0))  # Keep transactions sorted
 
             self.refresh_transaction_tree()
 
@@ -1619,8 +1654,6 @@ class RentalBillApp(ctk.CTk):
         for i in self.trans_tree.get_children():
             self.trans_tree.delete(i)
 
-        self.transactions.sort(key=lambda x: x[0])
-
         for date, item, qty, rent in self.transactions:
             action = "Rent" if qty > 0 else "Return"
             self.trans_tree.insert("", "end", values=(date, item, abs(qty), action))
@@ -1995,8 +2028,9 @@ class RentalBillApp(ctk.CTk):
             messagebox.showerror("Error", "No customer loaded.")
             return
 
-        total_rent, previous_balance, payment_received, amount = self.calculate_totals()
-        pdf_path = self.create_pdf_bill(total_rent, previous_balance, payment_received, amount, self.enable_qr)
+        total_rent, previous_balance, payment_received, amount, item_rents = self.calculate_totals()
+        pdf_path = self.create_pdf_bill(total_rent, previous_balance, payment_received, amount, item_rents,
+                                        self.enable_qr)
 
         try:
             image_path = self.convert_pdf_to_high_quality_image(pdf_path)
@@ -2054,7 +2088,7 @@ Best regards,
             return
 
         for item in selected:
-            file_path = self.pdf_results_tree.item(item, "values")[4]
+            file_path = self.pdf_results_tree.set(item, "path")
             try:
                 # --- STEP 1: Open File Explorer and select the file ---
                 abs_path = os.path.abspath(file_path)
@@ -2116,7 +2150,7 @@ Best regards,
         balance_card.grid(row=0, column=1, padx=15, pady=10, sticky="e")
 
         # Calculate current balance
-        total_rent, prev_bal, pay_recv, grand_total = self.calculate_totals()
+        total_rent, prev_bal, pay_recv, grand_total, _ = self.calculate_totals()
         self.current_due_amount = grand_total
 
         balance_frame = ctk.CTkFrame(balance_card, fg_color="transparent")
@@ -2458,7 +2492,7 @@ Best regards,
             self.payment_received.set(payment_received)
 
             # Calculate current due
-            total_rent, prev_bal, pay_recv, grand_total = self.calculate_totals()
+            total_rent, prev_bal, pay_recv, grand_total, _ = self.calculate_totals()
             self.current_due_amount = grand_total
 
             # Update balance display
@@ -2937,8 +2971,7 @@ Best regards,
         pdf.ln(3)
 
         # --- RECEIPT INFO ---
-        col1_width = 25
-        col2_width = 45
+        col1_width, col2_width = self.RECEIPT_INFO_COLUMNS
 
         # Receipt metadata
         pdf.set_font(font_name, "B", 9)
@@ -2977,22 +3010,14 @@ Best regards,
         pdf.set_font(font_name, "", 9)
 
         # Payment details table
-        table_col1 = 30
-        table_col2 = 40
-
-        pdf.cell(table_col1, 5, "Payment Date:", 0, 0)
-        pdf.cell(table_col2, 5, values[1], 0, 1)
-
-        pdf.cell(table_col1, 5, "Amount Paid:", 0, 0)
-        pdf.set_font(font_name, "B", 10)
-        pdf.cell(table_col2, 5, values[2].replace("₹",''), 0, 1)
-        pdf.set_font(font_name, "", 9)
-
-        pdf.cell(table_col1, 5, "Payment Method:", 0, 0)
-        pdf.cell(table_col2, 5, values[3].upper(), 0, 1)
+        table_col1, table_col2 = self.RECEIPT_TABLE_COLUMNS
 
-        pdf.cell(table_col1, 5, "Reference:", 0, 0)
-        pdf.cell(table_col2, 5, values[4], 0, 1)
+        self._write_receipt_rows(pdf, font_name, (
+            ("Payment Date:", values[1], False),
+            ("Amount Paid:", values[2].replace("₹", ''), True),
+            ("Payment Method:", values[3].upper(), False),
+            ("Reference:", values[4], False),
+        ))
 
         # Notes if available
         if values[5]:
@@ -3018,13 +3043,11 @@ Best regards,
         pdf.multi_cell(0, 3, "Terms: Goods sold are not returnable. Warranty as per manufacturer policy.")
 
         # Barcode with receipt number (optional)
-        try:
+        if self.HAVE_CODE39:
             pdf.ln(5)
             # Generate Code 39 barcode
             pdf.code39(f"*{values[0]}*", x=20, y=pdf.get_y(), w=0.5, h=12)
             pdf.set_y(pdf.get_y() + 15)
-        except:
-            pass
 
         # Final print timestamp
         pdf.set_font(font_name, "", 7)
@@ -3036,13 +3059,7 @@ Best regards,
         pdf.set_dash_pattern(dash=1, gap=1)  # Dashed line for cutting guide
         pdf.line(5, pdf.get_y(), 75, pdf.get_y())
 
-        # Save PDF
-        receipt_dir = "receipts"
-        os.makedirs(receipt_dir, exist_ok=True)
-        receipt_path = f"{receipt_dir}/Receipt_{values[0]}.pdf"
-        pdf.output(receipt_path)
-
-        # Open the PDF automatically
+        # Save and open the PDF automatically
         receipt_dir = "receipts"
         try:
             # Create receipts directory if it doesn't exist
@@ -3050,6 +3067,7 @@ Best regards,
 
             receipt_path = os.path.join(receipt_dir, f"Receipt_{values[0]}.pdf")
             pdf.output(receipt_path)
+            self._invalidate_pdf_dir_cache(receipt_path)
 
             # Verify file was created before trying to open it
             if os.path.exists(receipt_path):
@@ -3067,6 +3085,22 @@ Best regards,
             messagebox.showerror("Error", f"Failed to save receipt: {str(e)}",
                                  parent=self.payment_tree.winfo_toplevel())
 
+    def _write_receipt_rows(self, pdf, font_name, rows):
+        """Write label/value rows of the receipt payment table.
+
+        Each row is (label, value, emphasised); emphasised values are printed
+        in bold 10pt and the table font is restored afterwards.
+        """
+        label_width, value_width = self.RECEIPT_TABLE_COLUMNS
+        for label, value, emphasised in rows:
+            pdf.cell(label_width, 5, label, 0, 0)
+            if emphasised:
+                pdf.set_font(font_name, "B", 10)
+                pdf.cell(value_width, 5, value, 0, 1)
+                pdf.set_font(font_name, "", 9)
+            else:
+                pdf.cell(value_width, 5, value, 0, 1)
+
     def _save_payment_ledger(self, window):
         """Save payment data with simplified structure"""
         try:
@@ -3111,8 +3145,7 @@ Best regards,
             data["payment_received"] = total_received
 
             # Save to file
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=4)
+            self._write_json_atomic(file_path, data)
 
             # Update main application
             self.payment_received.set(total_received)
@@ -3143,14 +3176,17 @@ Best regards,
             self.payment_received.set(data.get("payment_received", 0.0))
 
             self.items = data.get("items", [])
-            for item in self.items:
-                self.item_tree.insert("", "end", values=(item[0], f"₹{item[1]:.2f}"))
-            self.item_combo.configure(values=[item[0] for item in self.items])
+            item_names = []
+            for name, rent in self.items:
+                item_names.append(name)
+                self.item_tree.insert("", "end", values=(name, f"₹{rent:.2f}"))
+            self.item_combo.configure(values=item_names)
 
             self.transactions = []
             for tx in data.get("transactions", []):
                 date_obj = dt.datetime.strptime(tx["date"], "%Y-%m-%d").date()
                 self.transactions.append((date_obj, tx["item"], tx["qty"], tx["rent"]))
+            self.transactions.sort(key=itemgetter(0))
 
             self.refresh_transaction_tree()
             self.update_in_hand_summary()
@@ -3162,6 +3198,15 @@ Best regards,
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
+    def _write_json_atomic(self, file_path, data):
+        """Write JSON via a temp sibling and os.replace so a crash never leaves a half-written file"""
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(data, indent=4).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+
     def save_customer_data(self):
         """Save customer data to a JSON file named after the customer ID."""
         cust_id = self.customer_id.get().strip()
@@ -3201,8 +3246,7 @@ Best regards,
             ]
         }
 
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        self._write_json_atomic(file_path, data)
 
         messagebox.showinfo("Saved", f"Customer data saved successfully to '{cust_id}.json'")
         self.refresh_dashboard()
@@ -3539,7 +3583,7 @@ Best regards,
                 self._clear_pdf_preview()
                 return
 
-            file_path = self.pdf_results_tree.item(selected[0], "values")[4]
+            file_path = self.pdf_results_tree.set(selected[0], "path")
             self._clear_pdf_preview("Loading preview...")
             self.pdf_preview_frame.update_idletasks()
 
@@ -3604,8 +3648,6 @@ Best regards,
             matrix = fitz.Matrix(final_zoom, final_zoom).prescale(2, 2)
             pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
             img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-            from PIL import ImageFilter
             img = img.filter(ImageFilter.SHARPEN)
             pdf_img = ctk.CTkImage(img, size=(img.width, img.height))
 
@@ -3724,106 +3766,133 @@ Best regards,
         }
         min_size, max_size = size_ranges.get(size_filter, (0, float('inf')))
 
-        # Clear previous results
-        for item in self.pdf_results_tree.get_children():
-            self.pdf_results_tree.delete(item)
-
         # Search in both directories
         search_dirs = []
-        if file_type in ["All", "Bills"]:
+        if file_type in ["All", "Bills"] and os.path.exists("bills"):
             search_dirs.append("bills")
-        if file_type in ["All", "Receipts"]:
+        if file_type in ["All", "Receipts"] and os.path.exists("receipts"):
             search_dirs.append("receipts")
 
-        results = []
-        for dir_name in search_dirs:
-            if not os.path.exists(dir_name):
-                continue
-
-            for filename in os.listdir(dir_name):
-                if not filename.lower().endswith(".pdf"):
-                    continue
-
-                file_path = os.path.join(dir_name, filename)
-                file_time = os.path.getmtime(file_path)
-                file_date = dt.datetime.fromtimestamp(file_time).date()
-                file_size = os.path.getsize(file_path)
+        # Folder scans are I/O bound, so list bills and receipts concurrently
+        if len(search_dirs) > 1:
+            with ThreadPoolExecutor(max_workers=len(search_dirs)) as pool:
+                listings = list(pool.map(self._scan_pdf_dir, search_dirs))
+        else:
+            listings = [self._scan_pdf_dir(dir_name) for dir_name in search_dirs]
 
-                # Apply filters
-                if date_range and not (date_range[0] <= file_date <= date_range[1]):
+        results = []
+        for listing in listings:
+            for pdf in listing:
+                # Apply filters (cheapest first)
+                if not (min_size <= pdf["size"] <= max_size):
                     continue
 
-                if not (min_size <= file_size <= max_size):
+                if date_range and not (date_range[0] <= pdf["date"] <= date_range[1]):
                     continue
 
-                # Extract customer name from filename if possible
-                customer_name = "Unknown"
-                if "_" in filename:
-                    try:
-                        customer_part = filename.split("_")[1]
-                        customer_name = " ".join(
-                            [word.capitalize() for word in customer_part.replace(".pdf", "").split()]
-                        )
-                    except:
-                        pass
-
                 # Apply search term filter
-                if search_term:
-                    if (search_term not in filename.lower() and
-                            search_term not in customer_name.lower()):
-                        continue
+                if search_term and search_term not in pdf["search_text"]:
+                    continue
 
-                results.append({
-                    "path": file_path,
-                    "name": filename,
-                    "type": "Bill" if dir_name == "bills" else "Receipt",
-                    "date": file_date,
-                    "size": file_size,
-                    "customer": customer_name
-                })
+                results.append(pdf)
 
         # Sort by date (newest first)
         results.sort(key=lambda x: x["date"], reverse=True)
 
-        # Add to treeview
-        for pdf in results:
-            size_str = self._format_file_size(pdf["size"])
-            self.pdf_results_tree.insert("", "end", values=(
+        # Format every row first, then hand them to the treeview in one tight loop
+        rows = [
+            (
                 pdf["name"],
                 pdf["type"],
                 pdf["date"].strftime("%Y-%m-%d"),
-                size_str,
+                self._format_file_size(pdf["size"]),
                 pdf["path"],
                 pdf["customer"]
-            ))
+            )
+            for pdf in results
+        ]
+
+        # Clear previous results and add the new ones
+        tree = self.pdf_results_tree
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert("", "end", values=row)
+
+    def _scan_pdf_dir(self, dir_name):
+        """Return metadata for every PDF in a folder, reusing the last scan while the folder is unchanged"""
+        dir_mtime = os.stat(dir_name).st_mtime_ns
+        cached = self._pdf_dir_cache.get(dir_name)
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+
+        file_type = "Bill" if dir_name == "bills" else "Receipt"
+        pdfs = []
+        with os.scandir(dir_name) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.lower().endswith(".pdf") or not entry.is_file(follow_symlinks=False):
+                    continue
+
+                # One stat call gives both size and modification time
+                file_stat = entry.stat()
+
+                # Extract customer name from filename if possible
+                customer_name = "Unknown"
+                match = PDF_CUSTOMER_RE.match(filename)
+                if match:
+                    customer_name = " ".join(word.capitalize() for word in (match.group(1) or match.group(2)).split())
+
+                pdfs.append({
+                    "path": entry.path,
+                    "name": filename,
+                    "type": file_type,
+                    "date": dt.datetime.fromtimestamp(file_stat.st_mtime).date(),
+                    "size": file_stat.st_size,
+                    "customer": customer_name,
+                    # Lowercased filename and customer, newline-separated so a term can't span both
+                    "search_text": f"{filename}\n{customer_name}".lower()
+                })
+
+        self._pdf_dir_cache[dir_name] = (dir_mtime, pdfs)
+        return pdfs
+
+    def _invalidate_pdf_dir_cache(self, file_path):
+        """Drop the cached scan of the folder containing file_path after it is written or deleted"""
+        dir_name = os.path.basename(os.path.dirname(os.path.normpath(file_path.replace("\\", "/"))))
+        self._pdf_dir_cache.pop(dir_name, None)
 
     def _format_file_size(self, size_bytes):
         """Convert file size to human-readable format"""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return format_file_size(size_bytes)
+
+    def _parse_file_size(self, size_str):
+        """Convert a size produced by _format_file_size back to bytes for sorting"""
+        units = {"B": 1, "KB": 1024, "MB": 1024 * 1024, "GB": 1024 * 1024 * 1024}
+        try:
+            value, unit = size_str.split()
+            return float(value) * units[unit]
+        except (ValueError, KeyError):
+            return 0.0
 
     def _sort_pdf_results(self, column):
         """Sort results by selected column"""
-        items = [(self.pdf_results_tree.set(child, column), child)
-                 for child in self.pdf_results_tree.get_children("")]
-        items.sort()
+        tree = self.pdf_results_tree
+        children = tree.get_children("")
+        if not children:
+            return
 
         # Reverse if already sorted
-        if self.pdf_results_tree.heading(column, "text").endswith("↑"):
-            items.reverse()
-            self.pdf_results_tree.heading(column, text=column + " ↓")
-        else:
-            self.pdf_results_tree.heading(column, text=column + " ↑")
+        reverse = tree.heading(column, "text").endswith("↑")
+        tree.heading(column, text=column + (" ↓" if reverse else " ↑"))
+
+        # Compare sizes numerically; everything else case-insensitively
+        sort_value = self._parse_file_size if column == "size" else str.lower
+        ordered = sorted(children, key=lambda child: sort_value(tree.set(child, column)), reverse=reverse)
 
         # Rearrange items in sorted order
-        for index, (val, child) in enumerate(items):
-            self.pdf_results_tree.move(child, "", index)
+        tree.detach(*children)
+        for child in ordered:
+            tree.reattach(child, "", "end")
 
     def _open_selected_pdf(self):
         """Open selected PDF file(s)"""
@@ -3833,7 +3902,7 @@ Best regards,
             return
 
         for item in selected:
-            file_path = self.pdf_results_tree.item(item, "values")[4]
+            file_path = self.pdf_results_tree.set(item, "path")
             try:
                 os.startfile(file_path)
             except Exception as e:
@@ -3847,7 +3916,8 @@ Best regards,
             messagebox.showwarning("Warning", "Please select at least one file")
             return
 
-        file_list = "\n".join(self.pdf_results_tree.item(item, "values")[0] for item in selected)
+        paths = [(item, self.pdf_results_tree.set(item, "path")) for item in selected]
+        file_list = "\n".join(os.path.basename(file_path) for _, file_path in paths)
 
         if messagebox.askyesno(
                 "Confirm Deletion",
@@ -3856,18 +3926,19 @@ Best regards,
         ):
             failed_deletions = []
 
-            for item in selected:
-                file_path = self.pdf_results_tree.item(item, "values")[4]
+            for item, file_path in paths:
                 try:
                     os.remove(file_path)
+                    self._invalidate_pdf_dir_cache(file_path)
                     self.pdf_results_tree.delete(item)
                 except Exception as e:
                     failed_deletions.append(f"{os.path.basename(file_path)}: {str(e)}")
 
             if failed_deletions:
+                failed_list = "\n".join(failed_deletions)
                 messagebox.showerror(
                     "Partial Success",
-                    f"Could not delete some files:\n\n{'\n'.join(failed_deletions)}"
+                    f"Could not delete some files:\n\n{failed_list}"
                 )
             else:
                 messagebox.showinfo("Success", "Selected files deleted successfully")
@@ -3883,7 +3954,7 @@ Best regards,
             return
 
         for item in selected:
-            file_path = self.pdf_results_tree.item(item, "values")[4]
+            file_path = self.pdf_results_tree.set(item, "path")
             try:
                 # This requires the system to have a PDF reader with print command line support
                 os.startfile(file_path, "print")
@@ -3893,44 +3964,46 @@ Best regards,
     def convert_pdf_to_high_quality_image(self, pdf_path, output_image_path="full_bill_image.png", dpi=350):
         """Convert PDF to high quality image for WhatsApp sharing with improved quality"""
         try:
-            doc = fitz.open(pdf_path)
-            images = []
+            # Increase DPI and use anti-aliasing for better quality
+            matrix = fitz.Matrix(dpi / 72, dpi / 72).prescale(2, 2)  # 2x supersampling for anti-aliasing
 
-            for page_num, page in enumerate(doc):
-                # Increase DPI and use anti-aliasing for better quality
-                matrix = fitz.Matrix(dpi / 72, dpi / 72).prescale(2, 2)  # 2x supersampling for anti-aliasing
-                pix = page.get_pixmap(matrix=matrix,
-                                      colorspace=fitz.csRGB,
-                                      alpha=False)
+            # PyMuPDF documents are not thread-safe, so pages are rendered in order while
+            # the sharpening of already-rendered pages runs on worker threads
+            with fitz.open(pdf_path) as doc, ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+                sharpen_jobs = []
+                for page in doc:
+                    pix = page.get_pixmap(matrix=matrix,
+                                          colorspace=fitz.csRGB,
+                                          alpha=False)
 
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
 
-                # Apply slight sharpening to enhance text clarity
-                from PIL import ImageFilter
-                img = img.filter(ImageFilter.SHARPEN)
+                    # Apply slight sharpening to enhance text clarity
+                    sharpen_jobs.append(pool.submit(img.filter, ImageFilter.SHARPEN))
 
-                images.append(img)
+                images = [job.result() for job in sharpen_jobs]
 
             # Calculate total height and max width
             total_height = sum(img.height for img in images)
             max_width = max(img.width for img in images)
 
             # Create final image with white background
-            final_image = Image.new("RGB", (max_width, total_height), color=(255, 255, 255))
+            canvas = np.full((total_height, max_width, 3), 255, dtype=np.uint8)
 
-            # Paste images with proper alignment
+            # Copy page pixels into place with proper alignment
             y_offset = 0
             for img in images:
                 # Center each page horizontally if they have different widths
                 x_offset = (max_width - img.width) // 2
-                final_image.paste(img, (x_offset, y_offset))
+                canvas[y_offset:y_offset + img.height, x_offset:x_offset + img.width] = np.asarray(img)
                 y_offset += img.height
 
-            # Save with maximum quality
+            final_image = Image.fromarray(canvas)
+
+            # PNG is lossless; a low zlib level keeps full quality while encoding much faster
             final_image.save(output_image_path,
                              format="PNG",
-                             optimize=True,
-                             quality=95,  # Maximum quality for PNG
+                             compress_level=1,
                              dpi=(dpi, dpi))  # Set DPI metadata
 
             return output_image_path
@@ -3940,39 +4013,53 @@ Best regards,
             return None
 
     def calculate_totals(self):
-        """Calculate rental totals including payment received"""
+        """Calculate rental totals including payment received.
+
+        Also returns the per-item rent breakdown ({item: [daily rent, total rent, days]})
+        used by the bill's rent summary, ordered by when each item was first out on rent.
+        """
         if not self.transactions:
             previous_balance = self.previous_balance.get()
             payment_received = self.payment_received.get()
             grand_total = previous_balance - payment_received
-            return 0, previous_balance, payment_received, grand_total
+            return 0, previous_balance, payment_received, grand_total, {}
 
-        sorted_trans = sorted(self.transactions, key=lambda x: x[0])
+        sorted_trans = self.transactions  # kept in date order on every change
+        n = len(sorted_trans)
 
-        item_rents = {}
-        current_items = {item[0]: 0 for item in self.items}
+        item_index = {name: i for i, (name, _) in enumerate(self.items)}
+        prices = np.asarray([price for _, price in self.items], dtype=np.float64)
 
-        for i in range(len(sorted_trans)):
-            date, item_name, qty, rent = sorted_trans[i]
-            if item_name not in current_items: continue
-            current_items[item_name] += qty
+        # Transactions for items no longer in the item list are skipped, along with the interval they open
+        known = np.fromiter((t[1] in item_index for t in sorted_trans), dtype=bool, count=n)
+        idx = np.fromiter((item_index.get(t[1], 0) for t in sorted_trans), dtype=np.intp, count=n)
+        qty = np.fromiter((t[2] for t in sorted_trans), dtype=np.float64, count=n)
+        dates = np.fromiter((t[0].toordinal() for t in sorted_trans), dtype=np.int64, count=n)
 
-            if i < len(sorted_trans) - 1:
-                next_date = sorted_trans[i + 1][0]
-                days = (next_date - date).days
+        # Running in-hand quantity of every item after each transaction
+        deltas = np.zeros((n, len(self.items)))
+        deltas[np.flatnonzero(known), idx[known]] = qty[known]
+        balances = np.cumsum(deltas, axis=0)
 
-                for item, count in current_items.items():
-                    if count > 0:
-                        item_rent_price = next((i[1] for i in self.items if i[0] == item), 0)
-                        rent_amount = days * count * item_rent_price
-                        item_rents[item] = item_rents.get(item, 0) + rent_amount
+        # Rent accrues on positive balances for the days until the next transaction
+        days = np.diff(dates) * known[:-1]
+        on_rent = balances[:-1] > 0
+        item_totals = (np.clip(balances[:-1], 0, None) * days[:, None]).sum(axis=0) * prices
+        item_days = (on_rent * days[:, None]).sum(axis=0)
+        total_rent = float(item_totals.sum())
+
+        item_rents = {}
+        rented_items = np.flatnonzero(on_rent.any(axis=0))
+        if rented_items.size:
+            first_on_rent = on_rent.argmax(axis=0)
+            for i in sorted(rented_items, key=lambda i: (first_on_rent[i], i)):
+                item_rents[self.items[i][0]] = [self.items[i][1], float(item_totals[i]), int(item_days[i])]
 
-        total_rent = sum(item_rents.values())
         previous_balance = self.previous_balance.get()
         payment_received = self.payment_received.get()
         grand_total = total_rent + previous_balance - payment_received
 
-        return total_rent, previous_balance, payment_received, grand_total
+        return total_rent, previous_balance, payment_received, grand_total, item_rents
 
     def generate_bill(self):
         """Generate a rental bill PDF"""
@@ -3989,9 +4076,10 @@ Best regards,
                                        "No transactions found. Generate a bill with only the previous balance?"):
                 return
 
-        total_rent, previous_balance, payment_received, grand_total = self.calculate_totals()
+        total_rent, previous_balance, payment_received, grand_total, item_rents = self.calculate_totals()
 
-        filename = self.create_pdf_bill(total_rent, previous_balance, payment_received, grand_total, self.enable_qr)
+        filename = self.create_pdf_bill(total_rent, previous_balance, payment_received, grand_total, item_rents,
+                                        self.enable_qr)
         messagebox.showinfo("Success", "Bill generated successfully!")
 
         try:
@@ -3999,7 +4087,8 @@ Best regards,
         except OSError:
             messagebox.showinfo("PDF Generated", f"Bill saved as:\n{filename}")
 
-    def create_pdf_bill(self, total_rent, previous_balance, payment_received, grand_total, include_qr=True):
+    def create_pdf_bill(self, total_rent, previous_balance, payment_received, grand_total, item_rents,
+                        include_qr=True):
         pdf = FPDF()
         pdf.add_page()
 
@@ -4028,7 +4117,7 @@ Best regards,
             return date_obj.strftime("%d-%b-%Y")  # e.g., "29-Jun-2025"
 
         def format_currency(amount):
-            return locale.currency(amount, grouping=True, symbol=False)
+            return f"{amount:,.2f}"
 
         # --- Header with Logo ---
         pdf.set_fill_color(*primary_color)
@@ -4112,47 +4201,45 @@ Best regards,
             set_font('B', 10)
 
             col_widths = [10, 30, 50, 20, 30, 50]
+            col_aligns = ['C', 'C', 'L', 'C', 'C', 'C']
             headers = ["#", "Date", "Item", "Qty", "In Hand", "Remarks"]
 
             for w, h in zip(col_widths, headers):
                 pdf.cell(w, 8, h, border=1, new_x=XPos.RIGHT, new_y=YPos.TOP, align='C', fill=True)
             pdf.ln(8)
 
-            # Table rows
+            # Table rows (only alternate rows are filled, so the fill colour is set once)
             pdf.set_text_color(0, 0, 0)
+            pdf.set_fill_color(*light_gray)
             set_font('', 10)
             fill = False
 
+            # Format every row up front so the cell loop only writes prepared strings
+            rows = []
             for idx, (date, item, qty, rent) in enumerate(transactions, start=1):
-                if item not in item_balances:
-                    item_balances[item] = 0
-
-                item_balances[item] += qty  # qty could be positive (rent) or negative (return)
-
-                if fill:
-                    pdf.set_fill_color(*light_gray)
-                else:
-                    pdf.set_fill_color(255, 255, 255)
-
-                pdf.cell(col_widths[0], 8, str(idx), border=1, align='C', fill=fill)
-                pdf.cell(col_widths[1], 8, date.strftime("%d-%b-%Y"), border=1, align='C', fill=fill)
-                pdf.cell(col_widths[2], 8, item, border=1, align='L', fill=fill)
-                pdf.cell(col_widths[3], 8, str(abs(qty)), border=1, align='C', fill=fill)
-                pdf.cell(col_widths[4], 8, str(item_balances[item]), border=1, align='C', fill=fill)
-                pdf.cell(col_widths[5], 8, "Returned items" if qty <= 0 else "Rented items", border=1, align='C',
-                         fill=fill)
+                item_balances[item] = item_balances.get(item, 0) + qty  # qty could be positive (rent) or negative (return)
+                rows.append((
+                    str(idx),
+                    date.strftime("%d-%b-%Y"),
+                    item,
+                    str(abs(qty)),
+                    str(item_balances[item]),
+                    "Returned items" if qty <= 0 else "Rented items"
+                ))
+
+            for row in rows:
+                for w, align, text in zip(col_widths, col_aligns, row):
+                    pdf.cell(w, 8, text, border=1, align=align, fill=fill)
                 pdf.ln(8)
 
                 fill = not fill
 
             pdf.ln(5)
 
-        # Sort transactions by date
-        sorted_transactions = sorted(self.transactions, key=lambda x: x[0])
-
-        # Create rented and returned tables
-        rented = [t for t in sorted_transactions if t[2] > 0]
-        returned = [t for t in sorted_transactions if t[2] <= 0]
+        # Create rented and returned tables (self.transactions is kept in date order)
+        rented, returned = [], []
+        for t in self.transactions:
+            (rented if t[2] > 0 else returned).append(t)
 
         create_transaction_table("ITEMS RENTED", rented)
         create_transaction_table("ITEMS RETURNED", returned)
@@ -4167,28 +4254,6 @@ Best regards,
         pdf.set_text_color(*primary_color)
         pdf.cell(0, 8, "RENT SUMMARY", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
 
-        # Calculate item days and rents
-        item_rents = {}
-        current_items = {item[0]: 0 for item in self.items}
-        item_days = {item[0]: 0 for item in self.items}
-
-        for i in range(len(sorted_transactions)):
-            date, item_name, qty, rent = sorted_transactions[i]
-            current_items[item_name] += qty
-
-            if i < len(sorted_transactions) - 1:
-                next_date = sorted_transactions[i + 1][0]
-                days = (next_date - date).days
-
-                for item, count in current_items.items():
-                    if count > 0:
-                        item_rent = next((i[1] for i in self.items if i[0] == item), 0)
-                        rent_amount = days * count * item_rent
-                        item_rents[item] = item_rents.get(item, [item_rent, 0, 0])
-                        item_rents[item][1] += rent_amount
-                        item_rents[item][2] += days
-                        item_days[item] += days
-
         # Summary table
         col_widths = [80, 30, 30, 50]
         headers = ["Item", "Daily Rent", "Days", "Total Rent"]
@@ -4202,17 +4267,13 @@ Best regards,
             pdf.cell(w, 8, h, border=1, new_x=XPos.RIGHT, new_y=YPos.TOP, align='C', fill=True)
         pdf.ln(8)
 
-        # Table rows
+        # Table rows (only alternate rows are filled, so the fill colour is set once)
         pdf.set_text_color(0, 0, 0)
+        pdf.set_fill_color(*light_gray)
         set_font('', 10)
         fill = False
 
         for item, (rent_price, total_rent_item, days) in item_rents.items():
-            if fill:
-                pdf.set_fill_color(*light_gray)
-            else:
-                pdf.set_fill_color(255, 255, 255)
-
             pdf.cell(col_widths[0], 8, item, border=1, new_x=XPos.RIGHT, new_y=YPos.TOP, align='L', fill=fill)
             pdf.cell(col_widths[1], 8, f"{rent_price:.2f}", border=1, new_x=XPos.RIGHT, new_y=YPos.TOP, align='R',
                      fill=fill)
@@ -4289,14 +4350,10 @@ Best regards,
             upi_amount = grand_total
             upi_payload = f"upi://pay?pa={upi_id}&pn={self.company_name}&am={upi_amount:.2f}&cu=INR"
 
-            qr = qrcode.make(upi_payload)
-            qr_path = "upi_qr.png"
-            qr.save(qr_path)
-
             # Center the QR code
             qr_size = 90
             qr_x = (pdf.w - qr_size) / 2
-            pdf.image(qr_path, x=qr_x, y=pdf.get_y() + 10, w=qr_size, h=qr_size)
+            pdf.image(io.BytesIO(upi_qr_png(upi_payload)), x=qr_x, y=pdf.get_y() + 10, w=qr_size, h=qr_size)
 
             pdf.ln(qr_size + 20)
 
@@ -4318,8 +4375,6 @@ Best regards,
             pdf.set_text_color(*dark_gray)
             pdf.cell(0, 6, "Scan the QR code above to make payment securely",
                      new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-
-            os.remove(qr_path)
         # --- Footer ---
         pdf.ln(15)
         pdf.set_draw_color(*primary_color)
@@ -4335,6 +4390,7 @@ Best regards,
         # Save PDF
         filename = rf"bills\Rental_Bill_{self.customer_name.get()}_{dt.date.today()}.pdf"
         pdf.output(filename)
+        self._invalidate_pdf_dir_cache(filename)
         return filename
 
 if __name__ == "__main__":
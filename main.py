@@ -1,35 +1,118 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import os
 import datetime as dt
-import locale
+import math
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
+from fpdf.fonts import FontFace
 import qrcode
 import base64
-from PIL import Image
+import csv
 import io
 import hashlib
+import heapq
+import hmac
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 import time
 import logging
-from typing import Dict, List, Optional, Any
-import plotly.express as px
-import plotly.graph_objects as go
+import pickle
+import tempfile
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Any
+from urllib.parse import quote, urlencode
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import segno
+except ImportError:  # segno is optional; fall back to qrcode + PIL
+    segno = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Set locale for currency formatting
-try:
-    locale.setlocale(locale.LC_ALL, 'en_IN')
-except locale.Error:
+
+# --- JSON File I/O ---
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _json_dumps_line(obj: Any) -> bytes:
+    """Serialize an object to compact single-line UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+# Without O_BINARY, Windows opens raw fds in text mode (CRLF translation, Ctrl-Z as EOF)
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """Read a whole file with raw os.read calls until end of file."""
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        chunks = []
+        # A short read is not end of file; only an empty read is
+        while True:
+            chunk = os.read(fd, _READ_CHUNK_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _json_load(path: str) -> Any:
+    """Read and parse a JSON file."""
+    return _json_loads(_read_file_bytes(path))
+
+
+def _atomic_write_bytes(path: str, data: bytes, mode: int = 0o644) -> None:
+    """Write bytes via a temp file and os.replace so readers never see a partial file (no fsync)."""
+    # mkstemp gives each concurrent writer (one per session thread) its own binary-mode temp file
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=os.path.dirname(path) or ".")
     try:
-        locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
-    except locale.Error:
-        locale.setlocale(locale.LC_ALL, '')
+        try:
+            os.chmod(tmp_path, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _json_dump(path: str, obj: Any, mode: int = 0o644) -> None:
+    """Atomically write an object to a JSON file."""
+    _atomic_write_bytes(path, _json_dumps(obj), mode)
 
 
 # --- Directory and Settings Management ---
@@ -53,50 +136,80 @@ def initialize_directories():
 
 
 def hash_password(password: str) -> str:
-    """Hashes a password using SHA256 for secure storage."""
+    """Hashes a password using SHA256 for secure storage. Use _DEFAULT_ADMIN_HASH for the built-in default."""
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """Check a password against a stored hash using a constant-time comparison."""
+    return bool(password_hash) and hmac.compare_digest(hash_password(password), password_hash)
+
+
+_DEFAULT_ADMIN_HASH = hashlib.sha256(b"admin123").hexdigest()
+
+_DEFAULT_SETTINGS = {
+    "name": "Jammu Shuttering Store",
+    "mobile": "9876543210",
+    "address": "Jammu, Jammu and Kashmir",
+    "email": "info@jammushuttering.com",
+    "website": "www.jammushuttering.com",
+    "upi_id": "jammushuttering@okhdfcbank",
+    "admin_password_hash": _DEFAULT_ADMIN_HASH,
+    "currency_symbol": "₹",
+    "date_format": "%d-%b-%Y",
+    "logo_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/e0/PlaceholderLC.png/768px-PlaceholderLC.png",
+    "business_hours": "9:00 AM - 6:00 PM",
+    "established_year": "2020",
+    "tagline": "Quality Shuttering Solutions for Your Construction Needs"
+}
+
+
+class CompanySettings(NamedTuple):
+    """Read-only snapshot of the company settings for hot formatting paths."""
+    name: str
+    mobile: str
+    address: str
+    email: str
+    website: str
+    upi_id: str
+    admin_password_hash: str
+    currency_symbol: str
+    date_format: str
+    logo_url: str
+    business_hours: str
+    established_year: str
+    tagline: str
+
+    @classmethod
+    def from_dict(cls, settings: Dict[str, Any]) -> "CompanySettings":
+        """Build a snapshot from a settings dict, filling gaps with defaults."""
+        return cls(**{field: settings.get(field, _DEFAULT_SETTINGS[field]) for field in cls._fields})
+
+
 @st.cache_resource
 def load_company_settings() -> Dict[str, Any]:
     """Load company settings with enhanced error handling and default password hashing."""
-    default_settings = {
-        "name": "Jammu Shuttering Store",
-        "mobile": "9876543210",
-        "address": "Jammu, Jammu and Kashmir",
-        "email": "info@jammushuttering.com",
-        "website": "www.jammushuttering.com",
-        "upi_id": "jammushuttering@okhdfcbank",
-        "admin_password_hash": hash_password("admin123"),
-        "currency_symbol": "₹",
-        "date_format": "%d-%b-%Y",
-        "logo_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/e0/PlaceholderLC.png/768px-PlaceholderLC.png",
-        "business_hours": "9:00 AM - 6:00 PM",
-        "established_year": "2020",
-        "tagline": "Quality Shuttering Solutions for Your Construction Needs"
-    }
+    default_settings = _DEFAULT_SETTINGS.copy()
     settings_file = "settings/config.json"
 
     try:
         if os.path.exists(settings_file):
-            with open(settings_file, "r", encoding='utf-8') as f:
-                settings_from_file = json.load(f)
-                company = settings_from_file.get("company", {})
-
-                if "admin_password" in company and "admin_password_hash" not in company:
-                    company["admin_password_hash"] = hash_password(company["admin_password"])
-                    del company["admin_password"]
-                    logger.warning("Converted 'admin_password' to 'admin_password_hash'. Please resave settings.")
-
-                for key, value in default_settings.items():
-                    if key not in company:
-                        company[key] = value
-                logger.info("Company settings loaded successfully.")
-                return company
+            settings_from_file = _json_load(settings_file)
+            company = settings_from_file.get("company", {})
+
+            if "admin_password" in company and "admin_password_hash" not in company:
+                company["admin_password_hash"] = hash_password(company["admin_password"])
+                del company["admin_password"]
+                logger.warning("Converted 'admin_password' to 'admin_password_hash'. Please resave settings.")
+
+            for key, value in default_settings.items():
+                if key not in company:
+                    company[key] = value
+            logger.info("Company settings loaded successfully.")
+            return company
         else:
             config = {"company": default_settings}
-            with open(settings_file, "w", encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            _json_dump(settings_file, config)
             logger.info("Default company settings created.")
             return default_settings
     except (json.JSONDecodeError, PermissionError) as e:
@@ -117,12 +230,11 @@ def save_company_settings(settings: Dict[str, Any]) -> bool:
             del settings["admin_password"]
 
         config = {"company": settings}
-        with open("settings/config.json", "w", encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        _json_dump("settings/config.json", config)
         logger.info("Company settings saved successfully.")
         load_company_settings.clear()
         return True
-    except (PermissionError, json.JSONEncodeError) as e:
+    except (PermissionError, TypeError, ValueError) as e:
         logger.error(f"Error saving company settings: {str(e)}")
         st.error(f"Error saving settings: {str(e)}")
         return False
@@ -135,6 +247,7 @@ def save_company_settings(settings: Dict[str, Any]) -> bool:
 # --- Session Management ---
 
 SESSION_EXPIRY_SECONDS = 86400  # 24 hours
+IO_WORKERS = min(16, (os.cpu_count() or 1) * 4)
 
 
 def create_session(user_id: str, user_type: str = "customer", user_data: Optional[Dict] = None) -> Optional[str]:
@@ -150,8 +263,7 @@ def create_session(user_id: str, user_type: str = "customer", user_data: Optiona
             "last_accessed": time.time()
         }
         session_file = f"sessions/{session_id}.json"
-        with open(session_file, "w", encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        _json_dump(session_file, session_data, mode=0o600)
         logger.info(f"Session created for user {user_id} ({user_type}) with ID {session_id[:8]}...")
         return session_id
     except Exception as e:
@@ -169,21 +281,22 @@ def get_session(session_id: str) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        with open(session_file, "r", encoding='utf-8') as f:
-            session_data = json.load(f)
-
+        # The session file's mtime is its last-accessed time; bumping it is a touch, not a rewrite.
+        last_accessed = os.path.getmtime(session_file)
         current_time = time.time()
-        if current_time - session_data.get("last_accessed", 0) > SESSION_EXPIRY_SECONDS:
+        if current_time - last_accessed > SESSION_EXPIRY_SECONDS:
             delete_session(session_id)
             logger.info(f"Expired session {session_id[:8]}... deleted.")
             return None
 
-        if current_time - session_data.get("last_accessed", 0) > 300:
-            session_data["last_accessed"] = current_time
-            with open(session_file, "w", encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
+        session_data = _json_load(session_file)
+
+        if current_time - last_accessed > 300:
+            os.utime(session_file, None)
+            last_accessed = current_time
             logger.debug(f"Session {session_id[:8]}... last accessed time updated.")
 
+        session_data["last_accessed"] = last_accessed
         return session_data
     except (FileNotFoundError, json.JSONDecodeError, PermissionError) as e:
         logger.error(f"Error getting session {session_id[:8]}...: {str(e)}")
@@ -211,8 +324,27 @@ def delete_session(session_id: str) -> bool:
         return False
 
 
+def _file_mtime(path: str) -> Optional[float]:
+    """Return a file's mtime, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+@st.cache_data(ttl=5)
+def json_dir_stats(directory: str) -> tuple:
+    """Return (count, total bytes) of the .json files in a directory, or (0, 0) if it is missing."""
+    try:
+        with os.scandir(directory) as entries:
+            sizes = [e.stat().st_size for e in entries if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return 0, 0
+    return len(sizes), sum(sizes)
+
+
 def cleanup_expired_sessions() -> int:
-    """Clean up expired and corrupted sessions."""
+    """Clean up expired sessions based on session file modification time."""
     sessions_dir = "sessions"
     if not os.path.exists(sessions_dir):
         logger.info(f"Session directory '{sessions_dir}' not found. No cleanup needed.")
@@ -222,23 +354,24 @@ def cleanup_expired_sessions() -> int:
     deleted_count = 0
 
     try:
-        session_files = [f for f in os.listdir(sessions_dir) if f.endswith(".json")]
-        for filename in session_files:
-            file_path = os.path.join(sessions_dir, filename)
+        # get_session touches the file on access, so the mtime is the
+        # last-accessed time and expiry needs only a stat, not a JSON parse.
+        with os.scandir(sessions_dir) as entries:
+            session_files = [(entry.name, entry.path) for entry in entries if entry.name.endswith(".json")]
+
+        # Stat in parallel; removals stay serial since they contend on the directory.
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            mtimes = list(executor.map(_file_mtime, [path for _, path in session_files]))
+
+        for (filename, file_path), mtime in zip(session_files, mtimes):
+            if mtime is None or current_time - mtime <= SESSION_EXPIRY_SECONDS:
+                continue
             try:
-                with open(file_path, "r", encoding='utf-8') as f:
-                    session_data = json.load(f)
-                if current_time - session_data.get("last_accessed", 0) > SESSION_EXPIRY_SECONDS:
-                    os.remove(file_path)
-                    deleted_count += 1
-                    logger.info(f"Cleaned up expired session: {filename[:8]}...")
-            except (json.JSONDecodeError, PermissionError) as e:
-                logger.warning(f"Corrupted or unreadable session file '{filename}': {str(e)}. Deleting.")
-                try:
-                    os.remove(file_path)
-                    deleted_count += 1
-                except Exception as del_e:
-                    logger.error(f"Failed to delete corrupted session file '{filename}': {str(del_e)}")
+                os.remove(file_path)
+                deleted_count += 1
+                logger.info(f"Cleaned up expired session: {filename[:8]}...")
+            except FileNotFoundError:
+                continue
             except Exception as e:
                 logger.error(f"Error processing session file '{filename}' during cleanup: {str(e)}")
                 continue
@@ -253,10 +386,28 @@ def cleanup_expired_sessions() -> int:
 
 # --- Helper Functions ---
 
+_DATE_INPUT_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d %b %Y", "%d-%b-%Y")
+
+
+@lru_cache(maxsize=4096)
+def _parse_and_format(date_str: str, format_str: str) -> str:
+    """Parse a date string in any supported input format and re-format it."""
+    try:
+        return dt.date.fromisoformat(date_str).strftime(format_str)
+    except ValueError:
+        pass
+    for fmt in _DATE_INPUT_FORMATS:
+        try:
+            return dt.datetime.strptime(date_str, fmt).strftime(format_str)
+        except ValueError:
+            pass
+    logger.warning(f"Could not parse date string: {date_str}. Returning original.")
+    return date_str
+
+
 def format_date(date_input: Any, format_str: str = "%d-%b-%Y") -> str:
     """Format date string or datetime object with error handling."""
-    global company
-    format_str = company.get('date_format', "%d-%b-%Y")
+    format_str = SETTINGS.date_format
 
     if not date_input:
         return "N/A"
@@ -265,36 +416,39 @@ def format_date(date_input: Any, format_str: str = "%d-%b-%Y") -> str:
         return date_input.strftime(format_str)
     elif isinstance(date_input, str):
         try:
-            date_obj = dt.datetime.strptime(date_input, "%Y-%m-%d").date()
-            return date_obj.strftime(format_str)
-        except ValueError:
-            try:
-                for fmt in ["%d-%m-%Y", "%d/%m/%Y", "%d %b %Y", "%d-%b-%Y"]:
-                    try:
-                        date_obj = dt.datetime.strptime(date_input, fmt).date()
-                        return date_obj.strftime(format_str)
-                    except ValueError:
-                        pass
-                logger.warning(f"Could not parse date string: {date_input}. Returning original.")
-                return str(date_input)
-            except Exception as e:
-                logger.warning(f"Error formatting date '{date_input}': {str(e)}. Returning original.")
-                return str(date_input)
+            return _parse_and_format(date_input, format_str)
+        except Exception as e:
+            logger.warning(f"Error formatting date '{date_input}': {str(e)}. Returning original.")
+            return str(date_input)
     else:
         logger.warning(f"Unsupported date format type: {type(date_input)}. Returning original.")
         return str(date_input)
 
 
+@lru_cache(maxsize=1024)
+def _format_indian_amount(amount: float) -> str:
+    """Format an amount to two decimals with Indian (lakh/crore) digit grouping."""
+    text = f"{amount:.2f}"
+    sign = ""
+    if text.startswith("-"):
+        sign, text = "-", text[1:]
+    whole, fraction = text.split(".")
+    head, groups = whole[:-3], [whole[-3:]]
+    while head:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return f"{sign}{','.join(groups)}.{fraction}"
+
+
 def format_currency(amount: Optional[float], symbol: str = "₹") -> str:
-    """Format currency with error handling and proper locale."""
-    global company
-    symbol = company.get('currency_symbol', '₹')
+    """Format currency with error handling and Indian digit grouping."""
+    symbol = SETTINGS.currency_symbol
 
     try:
         if amount is None:
             amount = 0.0
         amount_float = safe_float(amount)
-        formatted_amount = locale.format_string("%.2f", amount_float, grouping=True)
+        formatted_amount = _format_indian_amount(amount_float)
         return f"{symbol}{formatted_amount}"
     except (ValueError, TypeError) as e:
         logger.error(f"Error formatting currency amount '{amount}': {str(e)}")
@@ -304,8 +458,13 @@ def format_currency(amount: Optional[float], symbol: str = "₹") -> str:
         return f"{symbol}0.00"
 
 
-def safe_float(value: Any, default: float = 0.0) -> float:
+def safe_float(value: Any, default: float = 0.0, _numeric_types: tuple = (int, float)) -> float:
     """Safely convert value to float, handling None and non-numeric types."""
+    return float(value) if type(value) in _numeric_types else _slow_safe_float(value, default)
+
+
+def _slow_safe_float(value: Any, default: float = 0.0) -> float:
+    """Convert a non-int/float value to float, falling back to default."""
     if value is None:
         return default
     try:
@@ -315,28 +474,89 @@ def safe_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
-def generate_qr_code(upi_id: str, amount: Optional[float] = None, company_name: str = "") -> io.BytesIO:
-    """Generate UPI QR code with error handling."""
-    img_bytes = io.BytesIO()
+# Payment histories shorter than this render as an inline SVG sparkline rather than a Plotly chart.
+TREND_CHART_MIN_POINTS = 10
+
+
+def _sparkline_svg(values: List[float], width: int = 300, height: int = 60) -> str:
+    """Render a short series of values as a minimal inline SVG line."""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    step = width / (len(values) - 1)
+    points = " ".join(f"{i * step:.1f},{height - 2 - (v - low) / span * (height - 4):.1f}"
+                      for i, v in enumerate(values))
+    return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<polyline fill="none" stroke="#007bff" stroke-width="2" points="{points}"/></svg>')
+
+
+def _plotly_express():
+    """Import plotly.express on first use; only the chart sections need it."""
+    import plotly.express as px
+    return px
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _pie_chart(values: tuple, names: tuple, title: Optional[str] = None, height: Optional[int] = None):
+    """Build a Plotly pie chart once per distinct input; reruns reuse the cached figure."""
+    fig = _plotly_express().pie(values=list(values), names=list(names), title=title)
+    if height:
+        fig.update_layout(height=height)
+    return fig
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _xy_chart(kind: str, frame: pd.DataFrame, x: str, y: str, title: Optional[str] = None,
+              layout: Optional[Dict[str, Any]] = None, markers: bool = False):
+    """Build a Plotly Express line/bar chart once per distinct input; reruns reuse the cached figure."""
+    options = {"markers": True} if markers else {}
+    fig = getattr(_plotly_express(), kind)(frame, x=x, y=y, title=title, **options)
+    if layout:
+        fig.update_layout(**layout)
+    return fig
+
+
+def build_upi_url(upi_id: str, company_name: str, amount: Optional[float] = None, note: str = "") -> str:
+    """Build a UPI payment link with properly escaped query parameters."""
+    params = {"pa": upi_id, "pn": company_name}
+    if amount is not None and safe_float(amount) > 0:
+        params["am"] = f"{safe_float(amount):.2f}"
+    params["cu"] = "INR"
+    if note:
+        params["tn"] = note
+    return "upi://pay?" + urlencode(params, safe="@", quote_via=quote)
+
+
+QR_MASK_PATTERN = 0
+
+
+@lru_cache(maxsize=64)
+def _qr_png(data: str) -> bytes:
+    """Render data as QR code PNG bytes, memoized since the same payment QR is shown on every rerun."""
+    # A fixed mask skips scoring all eight mask patterns, the bulk of encoding time; any mask is valid.
+    buffer = io.BytesIO()
+    if segno is not None:
+        segno.make(data, error="l", micro=False, mask=QR_MASK_PATTERN).save(buffer, kind="png", scale=10, border=4)
+    else:
+        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4,
+                           mask_pattern=QR_MASK_PATTERN)
+        qr.add_data(data)
+        qr.make(fit=True)
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=256, ttl=3600)
+def generate_qr_code_bytes(upi_id: str, amount: Optional[float] = None, company_name: str = "") -> bytes:
+    """Generate UPI QR code PNG bytes with error handling."""
+    img_bytes = b""
     try:
         if not upi_id:
             logger.warning("UPI ID is empty, cannot generate QR code.")
             return img_bytes
 
-        safe_company_name = company_name.replace(' ', '%20').replace('&', '%26')
-        upi_url = f"upi://pay?pa={upi_id}&pn={safe_company_name}"
-
-        if amount is not None and safe_float(amount) > 0:
-            upi_url += f"&am={safe_float(amount):.2f}"
-        upi_url += "&cu=INR"
+        upi_url = build_upi_url(upi_id, company_name, amount)
 
-        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
-        qr.add_data(upi_url)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(img_bytes, format="PNG")
-        img_bytes.seek(0)
+        img_bytes = _qr_png(upi_url)
         logger.info(f"QR code generated for UPI ID: {upi_id} with amount: {amount}")
         return img_bytes
     except Exception as e:
@@ -346,36 +566,87 @@ def generate_qr_code(upi_id: str, amount: Optional[float] = None, company_name:
 
 # --- Customer Data Management ---
 
+# data/<customer_id>.json is the source of truth and is shared with the desktop app
+# (Jammu_Shuttering_Store.py), so records stay one JSON file per customer. Lookups avoid
+# directory walks through in-memory indexes instead: _customer_index maps mobile/ID to a
+# file, and get_all_customers reparses only files whose mtime or size changed.
+
+
+@st.cache_resource(ttl=300)
+def _customer_index() -> Dict[str, Dict[str, str]]:
+    """Map customer mobile numbers and IDs to their data file paths."""
+    index = {"by_mobile": {}, "by_id": {}}
+    customer_data_dir = "data"
+    if not os.path.exists(customer_data_dir):
+        logger.warning(f"Customer data directory '{customer_data_dir}' does not exist.")
+        return index
+
+    with os.scandir(customer_data_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                data = _json_load(entry.path)
+            except (json.JSONDecodeError, PermissionError) as e:
+                logger.warning(f"Could not read/parse customer file {entry.name}: {str(e)}. Skipping.")
+                continue
+            except Exception as e:
+                logger.warning(f"Unexpected error reading customer file {entry.name}: {str(e)}. Skipping.")
+                continue
+            mobile = str(data.get("mobile", "")).strip()
+            customer_id = str(data.get("customer_id", "")).strip()
+            if mobile:
+                index["by_mobile"].setdefault(mobile, entry.path)
+            if customer_id:
+                index["by_id"].setdefault(customer_id, entry.path)
+    logger.info(f"Indexed {len(index['by_id'])} customer records.")
+    return index
+
+
+def _normalize_payment_history(customer: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce payment amounts to float and keep the history in date order so readers can skip both steps."""
+    history = customer.get("payment_history")
+    if not history:
+        return customer
+    for p in history:
+        amount = p.get("amount", 0.0)
+        if type(amount) is not float:
+            p["amount"] = safe_float(amount)
+    # Stable, and linear on the usual already-ordered or appended-to history.
+    history.sort(key=lambda p: p.get("date", ""))
+    return customer
+
+
 def authenticate_customer(identifier: str) -> Optional[Dict[str, Any]]:
     """Authenticate customer by mobile number or customer ID."""
     if not identifier or not identifier.strip():
         return None
 
     identifier = identifier.strip()
-    customer_data_dir = "data"
 
     try:
-        if not os.path.exists(customer_data_dir):
-            logger.warning(f"Customer data directory '{customer_data_dir}' does not exist.")
-            return None
-
-        customer_files = [f for f in os.listdir(customer_data_dir) if f.endswith(".json")]
+        for attempt in range(2):
+            index = _customer_index()
+            file_path = index["by_mobile"].get(identifier) or index["by_id"].get(identifier)
+            if not file_path:
+                if attempt:
+                    break
+                # The customer may have been added outside the app since the index was built.
+                _customer_index.clear()
+                continue
 
-        for filename in customer_files:
-            file_path = os.path.join(customer_data_dir, filename)
             try:
-                with open(file_path, "r", encoding='utf-8') as f:
-                    data = json.load(f)
-                    if (str(data.get("mobile", "")).strip() == identifier or
-                            str(data.get("customer_id", "")).strip() == identifier):
-                        logger.info(f"Customer '{identifier}' authenticated.")
-                        return data
-            except (json.JSONDecodeError, PermissionError) as e:
-                logger.warning(f"Could not read/parse customer file {filename}: {str(e)}. Skipping.")
-                continue
-            except Exception as e:
-                logger.warning(f"Unexpected error reading customer file {filename}: {str(e)}. Skipping.")
-                continue
+                data = _normalize_payment_history(_json_load(file_path))
+            except FileNotFoundError:
+                data = {}
+            if (str(data.get("mobile", "")).strip() == identifier or
+                    str(data.get("customer_id", "")).strip() == identifier):
+                logger.info(f"Customer '{identifier}' authenticated.")
+                return data
+
+            # The file changed outside the app since the index was built.
+            logger.warning(f"Stale customer index entry for '{identifier}'. Rebuilding index.")
+            _customer_index.clear()
         logger.info(f"Customer '{identifier}' not found during authentication.")
         return None
     except Exception as e:
@@ -383,6 +654,30 @@ def authenticate_customer(identifier: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Parsed customer files keyed by filename: {filename: ((mtime_ns, size), data or None)}
+_CUSTOMER_CACHE: Dict[str, tuple] = {}
+
+
+def _customer_data_version() -> tuple:
+    """File versions behind the current get_all_customers result, as a cheap cache key."""
+    return tuple(sorted((filename, version) for filename, (version, _) in _CUSTOMER_CACHE.items()))
+
+
+def _load_customer_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Load and validate one customer file, returning None if it is unusable."""
+    filename = os.path.basename(file_path)
+    try:
+        data = _normalize_payment_history(_json_load(file_path))
+        if all(key in data and data[key] is not None for key in ["customer_id", "name", "mobile"]):
+            return data
+        logger.warning(f"Skipping customer file {filename} due to missing required fields.")
+    except (json.JSONDecodeError, PermissionError) as e:
+        logger.warning(f"Could not read/parse customer file {filename}: {str(e)}. Skipping.")
+    except Exception as e:
+        logger.warning(f"Unexpected error reading customer file {filename}: {str(e)}. Skipping.")
+    return None
+
+
 @st.cache_data(ttl=300)
 def get_all_customers() -> List[Dict[str, Any]]:
     """Get all customer data for admin panel with robust error handling."""
@@ -392,55 +687,92 @@ def get_all_customers() -> List[Dict[str, Any]]:
     try:
         if not os.path.exists(customer_data_dir):
             logger.warning(f"Customer data directory '{customer_data_dir}' does not exist. Returning empty list.")
+            _CUSTOMER_CACHE.clear()
             return customers
 
-        customer_files = [f for f in os.listdir(customer_data_dir) if f.endswith(".json")]
+        with os.scandir(customer_data_dir) as entries:
+            customer_files = [(e.name, e.path, e.stat()) for e in entries if e.name.endswith(".json")]
 
-        for filename in customer_files:
-            file_path = os.path.join(customer_data_dir, filename)
-            try:
-                with open(file_path, "r", encoding='utf-8') as f:
-                    data = json.load(f)
-                    if all(key in data and data[key] is not None for key in ["customer_id", "name", "mobile"]):
-                        customers.append(data)
-                    else:
-                        logger.warning(f"Skipping customer file {filename} due to missing required fields.")
-            except (json.JSONDecodeError, PermissionError) as e:
-                logger.warning(f"Could not read/parse customer file {filename}: {str(e)}. Skipping.")
-                continue
-            except Exception as e:
-                logger.warning(f"Unexpected error reading customer file {filename}: {str(e)}. Skipping.")
-                continue
-        logger.info(f"Loaded {len(customers)} customer records.")
-        return customers
+        stale = []
+        for filename, file_path, stat in customer_files:
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _CUSTOMER_CACHE.get(filename)
+            if cached is None or cached[0] != version:
+                stale.append((filename, file_path, version))
+
+        # File reads release the GIL, so overlapping them hides per-file latency on a cold cache.
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(stale))) as executor:
+                loaded = list(executor.map(_load_customer_file, [path for _, path, _ in stale]))
+        else:
+            loaded = [_load_customer_file(path) for _, path, _ in stale]
+        for (filename, _, version), data in zip(stale, loaded):
+            _CUSTOMER_CACHE[filename] = (version, data)
+
+        seen = {filename for filename, _, _ in customer_files}
+        for filename in _CUSTOMER_CACHE.keys() - seen:
+            del _CUSTOMER_CACHE[filename]
+
+        customers = [_CUSTOMER_CACHE[filename][1] for filename, _, _ in customer_files
+                     if _CUSTOMER_CACHE[filename][1] is not None]
+        logger.info(f"Loaded {len(customers)} customer records ({len(stale)} parsed from disk).")
+        # Callers edit the returned records in place, so hand out copies and keep the cache pristine.
+        return pickle.loads(pickle.dumps(customers, protocol=pickle.HIGHEST_PROTOCOL))
     except Exception as e:
         logger.error(f"Error getting all customers: {str(e)}")
         return []
 
 
+def _prepare_customer_record(customer_data: Dict[str, Any]) -> bool:
+    """Fill defaults, normalize and checkpoint a record in place; False if required fields are missing."""
+    required_fields = ["customer_id", "name", "mobile"]
+    if not all(field in customer_data and customer_data[field] for field in required_fields):
+        logger.error(f"Missing or empty required customer fields for save: {customer_data}")
+        return False
+
+    customer_data.setdefault("transactions", [])
+    customer_data.setdefault("payment_history", [])
+    customer_data.setdefault("items", [])
+    customer_data["previous_balance"] = safe_float(customer_data.get("previous_balance", 0.0))
+    _normalize_payment_history(customer_data)
+
+    checkpoint = _balance_checkpoint(customer_data)
+    if checkpoint:
+        customer_data["_balance_checkpoint"] = checkpoint
+    else:
+        customer_data.pop("_balance_checkpoint", None)
+    return True
+
+
+def _clear_customer_caches() -> None:
+    """Drop every cached view of customer records after a write."""
+    get_all_customers.clear()
+    _customer_index.clear()
+    calculate_customer_balance.clear()
+    _admin_aggregates.clear()
+    _admin_report_frames.clear()
+    _customer_statistics.clear()
+    _customer_json_export.clear()
+    _customer_ndjson_export.clear()
+    _financial_summary_columns.clear()
+    _financial_summary_csv.clear()
+    _financial_summary_parquet.clear()
+
+
 def save_customer_data(customer_data: Dict[str, Any]) -> bool:
     """Save customer data to file with comprehensive validation."""
     try:
-        required_fields = ["customer_id", "name", "mobile"]
-        if not all(field in customer_data and customer_data[field] for field in required_fields):
-            logger.error(f"Missing or empty required customer fields for save: {customer_data}")
+        if not _prepare_customer_record(customer_data):
             st.error("Missing required customer information (ID, Name, Mobile).")
             return False
 
-        customer_data.setdefault("transactions", [])
-        customer_data.setdefault("payment_history", [])
-        customer_data.setdefault("items", [])
-        customer_data["previous_balance"] = safe_float(customer_data.get("previous_balance", 0.0))
-
         filename = f"data/{customer_data['customer_id']}.json"
-        with open(filename, "w", encoding='utf-8') as f:
-            json.dump(customer_data, f, indent=4, ensure_ascii=False)
+        _json_dump(filename, customer_data)
         logger.info(f"Customer data saved for {customer_data['customer_id']}.")
 
-        get_all_customers.clear()
-        calculate_customer_balance.clear()
+        _clear_customer_caches()
         return True
-    except (PermissionError, json.JSONEncodeError) as e:
+    except (PermissionError, TypeError, ValueError) as e:
         logger.error(f"Error saving customer data for {customer_data.get('customer_id', 'N/A')}: {str(e)}")
         st.error(f"Permission or serialization error saving data: {str(e)}")
         return False
@@ -450,18 +782,125 @@ def save_customer_data(customer_data: Dict[str, Any]) -> bool:
         return False
 
 
-@st.cache_data(ttl=60)
-def calculate_customer_balance(customer: Dict[str, Any]) -> float:
-    """Calculate current balance for a customer."""
+def _write_customer_record(customer_data: Dict[str, Any]) -> bool:
+    """Write one prepared record to its file, logging instead of raising on failure."""
+    try:
+        _json_dump(f"data/{customer_data['customer_id']}.json", customer_data)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving customer data for {customer_data.get('customer_id', 'N/A')}: {str(e)}")
+        return False
+
+
+def save_customers_bulk(customers: List[Dict[str, Any]]) -> List[bool]:
+    """Save many customers with parallel file writes and a single cache flush."""
+    statuses = [False] * len(customers)
+    prepared = []
+    for i, customer_data in enumerate(customers):
+        try:
+            if _prepare_customer_record(customer_data):
+                prepared.append(i)
+        except Exception as e:
+            logger.error(f"Error preparing customer data for {customer_data.get('customer_id', 'N/A')}: {str(e)}")
+
+    if len(prepared) > 1:
+        with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(prepared))) as executor:
+            written = list(executor.map(_write_customer_record, [customers[i] for i in prepared]))
+    else:
+        written = [_write_customer_record(customers[i]) for i in prepared]
+    for i, ok in zip(prepared, written):
+        statuses[i] = ok
+
+    saved = [customer for customer, ok in zip(customers, statuses) if ok]
+    if saved:
+        logger.info(f"Bulk saved {len(saved)} customer records.")
+        _clear_customer_caches()
+    return statuses
+
+
+def set_pending_payments_status(all_pending: List[Dict[str, Any]], status: str) -> int:
+    """Mark pending payments approved/rejected, writing each customer once; returns the number of payments saved."""
+    now = dt.datetime.now().isoformat()
+    customers: Dict[str, Dict[str, Any]] = {}
+    counts: Dict[str, int] = {}
+    for item in all_pending:
+        payment = item['payment']
+        payment['status'] = status
+        payment[f'{status}_by'] = 'admin'
+        payment[f'{status}_at'] = now
+        cid = item['customer']['customer_id']
+        customers[cid] = item['customer']
+        counts[cid] = counts.get(cid, 0) + 1
+
+    statuses = save_customers_bulk(list(customers.values()))
+    return sum(counts[cid] for cid, ok in zip(customers, statuses) if ok)
+
+
+PAYMENT_STATUS_ICONS = {"approved": "✅", "pending": "⏳", "rejected": "❌"}
+
+
+class PaymentSummary(NamedTuple):
+    """Payments of one customer split by status, with the approved total and latest approved date."""
+    approved: List[Dict[str, Any]]
+    pending: List[Dict[str, Any]]
+    rejected: List[Dict[str, Any]]
+    approved_sum: float
+    latest_approved_date: Optional[str]
+
+
+def _partition_payments(history: List[Dict[str, Any]]) -> PaymentSummary:
+    """Split a payment history by status in a single pass; amounts must already be floats."""
+    approved, pending, rejected = [], [], []
+    approved_sum = 0.0
+    latest = None
+    latest_key = ""
+    for p in history:
+        status = p.get("status")
+        if status == "approved":
+            approved.append(p)
+            approved_sum += p.get("amount", 0.0)
+            key = p.get("date", "1900-01-01")
+            if latest is None or key > latest_key:
+                latest, latest_key = p, key
+        elif status == "pending":
+            pending.append(p)
+        elif status == "rejected":
+            rejected.append(p)
+    return PaymentSummary(approved, pending, rejected, approved_sum,
+                          latest.get("date", "") if latest is not None else None)
+
+
+def _item_quantities(transactions: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Net quantity held per item across a transaction list, in a single pass."""
+    _sf = safe_float
+    totals: Dict[str, float] = {}
+    for tx in transactions:
+        item = tx.get("item")
+        totals[item] = totals.get(item, 0.0) + _sf(tx.get("qty", 0))
+    return totals
+
+
+def _transactions_frame(transactions: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame of transactions with numeric quantities and parsed dates."""
+    tx_df = pd.DataFrame(transactions, columns=["date", "item", "qty"])
+    tx_df["item"] = tx_df["item"].fillna("")
+    tx_df["qty"] = tx_df["qty"].map(safe_float).astype(np.float64).fillna(0.0)
+    tx_df["Date"] = pd.to_datetime(tx_df["date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    return tx_df
+
+
+def _compute_balance(customer: Dict[str, Any], as_of: dt.date) -> tuple:
+    """Compute (balance, active quantities, daily rent, last transaction date) as of a date."""
+    _sf = safe_float  # local binding for the per-transaction loops below
     total_rent_accrued = 0.0
-    previous_balance_initial = safe_float(customer.get("previous_balance", 0))
+    previous_balance_initial = _sf(customer.get("previous_balance", 0))
 
     transactions_raw = customer.get("transactions", [])
     parsed_transactions = []
     for tx in transactions_raw:
         try:
             tx_date = dt.datetime.strptime(tx["date"], "%Y-%m-%d").date()
-            parsed_transactions.append((tx_date, tx.get("item", ""), safe_float(tx.get("qty", 0))))
+            parsed_transactions.append((tx_date, tx.get("item", ""), _sf(tx.get("qty", 0))))
         except (ValueError, KeyError) as e:
             logger.warning(
                 f"Skipping malformed transaction for customer {customer.get('customer_id', 'N/A')}: {tx}. Error: {e}")
@@ -469,48 +908,233 @@ def calculate_customer_balance(customer: Dict[str, Any]) -> float:
 
     parsed_transactions.sort(key=lambda x: x[0])
 
-    item_daily_rents = {item_info[0]: safe_float(item_info[1])
+    item_daily_rents = {item_info[0]: _sf(item_info[1])
                         for item_info in customer.get("items", [])
                         if isinstance(item_info, (list, tuple)) and len(item_info) >= 2}
 
-    current_item_quantities = {}
+    approved_payments_sum = math.fsum(p.get("amount", 0.0) for p in customer.get("payment_history", ())
+                                      if p.get("status") == "approved")
 
     if not parsed_transactions:
-        approved_payments_sum = sum(safe_float(p.get("amount", 0)) for p in customer.get("payment_history", []) if
-                                    p.get("status") == "approved")
-        return previous_balance_initial - approved_payments_sum
+        return previous_balance_initial - approved_payments_sum, {}, 0.0, None
+
+    # Running quantity of each rented item after every transaction date, one row per date.
+    # Items without a daily rent get a zero rate but still contribute their dates to the timeline.
+    item_columns: Dict[Any, int] = {}
+    item_idx = np.fromiter((item_columns.setdefault(item, len(item_columns)) for _, item, _ in parsed_transactions),
+                           dtype=np.intp, count=len(parsed_transactions))
+    tx_dates = np.array([tx_date for tx_date, _, _ in parsed_transactions], dtype="datetime64[D]")
+    qtys = np.fromiter((qty for _, _, qty in parsed_transactions), dtype=np.float64, count=len(parsed_transactions))
+    unique_dates, date_idx = np.unique(tx_dates, return_inverse=True)
+    quantities = np.zeros((len(unique_dates), len(item_columns)), dtype=np.float64)
+    np.add.at(quantities, (date_idx, item_idx), qtys)
+    quantities = quantities.cumsum(axis=0)
+
+    dates = np.append(unique_dates, np.datetime64(as_of, "D"))
+    day_gaps = np.maximum(np.diff(dates).astype(np.int64), 0)
+    rates = np.array([item_daily_rents.get(item, 0.0) for item in item_columns], dtype=np.float64)
+    held = np.clip(quantities, 0, None)
+    daily_rent = held @ rates
+    total_rent_accrued = float(daily_rent @ day_gaps)
+
+    active_quantities = {item: float(qty) for item, qty in zip(item_columns, held[-1]) if qty > 0}
+    final_balance = previous_balance_initial + total_rent_accrued - approved_payments_sum
+    return final_balance, active_quantities, float(daily_rent[-1]), parsed_transactions[-1][0]
+
 
-    last_processed_date = None
+def _balance_fingerprint(customer: Dict[str, Any]) -> str:
+    """Digest of every input to the balance calculation, used to validate a stored checkpoint."""
+    # Always the stdlib serializer, so the digest does not depend on whether orjson is installed
+    payload = json.dumps([customer.get("previous_balance", 0), customer.get("items", []),
+                          customer.get("transactions", []), customer.get("payment_history", [])],
+                         sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
-    for item_name in item_daily_rents:
-        current_item_quantities[item_name] = 0
 
-    for i, (current_date, item_name, qty_change) in enumerate(parsed_transactions):
-        if last_processed_date is not None:
-            days_diff = (current_date - last_processed_date).days
-            if days_diff > 0:
-                for item, count in current_item_quantities.items():
-                    if count > 0 and item in item_daily_rents:
-                        total_rent_accrued += days_diff * count * item_daily_rents[item]
+def _balance_checkpoint(customer: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build today's balance checkpoint, or None if future-dated transactions make accrual non-linear."""
+    today = dt.date.today()
+    balance, active_quantities, daily_rent, last_tx_date = _compute_balance(customer, today)
+    if last_tx_date is not None and last_tx_date > today:
+        return None
+    return {
+        "date": today.isoformat(),
+        "balance": balance,
+        "daily_rent": daily_rent,
+        "active_quantities": active_quantities,
+        "fingerprint": _balance_fingerprint(customer)
+    }
 
-        if item_name in item_daily_rents:
-            current_item_quantities[item_name] = current_item_quantities.get(item_name, 0) + qty_change
 
-        last_processed_date = current_date
+@st.cache_data(ttl=60)
+def calculate_customer_balance(customer: Dict[str, Any]) -> float:
+    """Calculate current balance for a customer, extending a saved checkpoint when it is still valid."""
+    today = dt.date.today()
+    checkpoint = customer.get("_balance_checkpoint")
+    if checkpoint:
+        try:
+            days = (today - dt.date.fromisoformat(checkpoint["date"])).days
+            if days >= 0 and checkpoint["fingerprint"] == _balance_fingerprint(customer):
+                return checkpoint["balance"] + checkpoint["daily_rent"] * days
+        except (KeyError, TypeError, ValueError):
+            pass
+    return _compute_balance(customer, today)[0]
 
-    if last_processed_date is not None:
-        today = dt.date.today()
-        days_since_last_tx = (today - last_processed_date).days
-        if days_since_last_tx > 0:
-            for item, count in current_item_quantities.items():
-                if count > 0 and item in item_daily_rents:
-                    total_rent_accrued += days_since_last_tx * count * item_daily_rents[item]
 
-    approved_payments_sum = sum(
-        safe_float(p.get("amount", 0)) for p in customer.get("payment_history", []) if p.get("status") == "approved")
+def _customer_search_key(customer: Dict[str, Any]) -> str:
+    """Lowercased name, ID and mobile joined by newlines, which a search box cannot contain."""
+    return f"{customer.get('name', '')}\n{customer.get('customer_id', '')}\n{customer.get('mobile', '')}".lower()
+
+
+@st.cache_resource(max_entries=1)
+def _admin_aggregates(data_version: tuple) -> Dict[str, Dict[str, Any]]:
+    """Per-customer figures for the admin panel keyed by customer ID, rebuilt when any customer file changes."""
+    customers = get_all_customers()
+    balances = {c["customer_id"]: calculate_customer_balance(c) for c in customers}
+    return {
+        "balances": balances,
+        "payment_summaries": {c["customer_id"]: _partition_payments(c.get("payment_history", []))
+                              for c in customers},
+        "item_quantities": {c["customer_id"]: _item_quantities(c.get("transactions", [])) for c in customers},
+        "search_keys": {c["customer_id"]: _customer_search_key(c) for c in customers},
+        "labels": {c["customer_id"]: f"{c.get('name')} ({c['customer_id']}) - {format_currency(balances[c['customer_id']])}"
+                   for c in customers}
+    }
+
+
+@st.cache_resource(max_entries=1)
+def _admin_report_frames(data_version: tuple) -> Dict[str, pd.DataFrame]:
+    """Flattened transaction, per-item and approved-payment tables for the reports, rebuilt when any file changes."""
+    customers = get_all_customers()
+    tx_cols = {"Customer": [], "Customer_ID": [], "Date": [], "Item": [], "Quantity": [], "Action": []}
+    pay_cols = {"Date": [], "Amount": [], "Method": []}
+    item_totals: Dict[str, float] = {}
+    item_counts: Dict[str, int] = {}
+    for c in customers:
+        name, cid = c.get('name'), c.get('customer_id')
+        for tx in c.get("transactions", []):
+            qty = safe_float(tx.get('qty', 0))
+            item = tx.get('item')
+            tx_cols["Customer"].append(name)
+            tx_cols["Customer_ID"].append(cid)
+            tx_cols["Date"].append(tx.get('date'))
+            tx_cols["Item"].append(item)
+            tx_cols["Quantity"].append(qty)
+            tx_cols["Action"].append("Rent" if qty > 0 else "Return")
+            if item is not None:
+                item_totals[item] = item_totals.get(item, 0.0) + qty
+                item_counts[item] = item_counts.get(item, 0) + 1
+        for p in c.get("payment_history", []):
+            if p.get("status") == "approved":
+                pay_cols["Date"].append(p.get('date'))
+                pay_cols["Amount"].append(p.get('amount', 0.0))
+                pay_cols["Method"].append(p.get('method', 'Unknown'))
+
+    # Column lists go straight into ndarrays instead of pandas walking one dict per row.
+    transactions_df = pd.DataFrame(tx_cols).astype({
+        "Customer_ID": "category", "Item": "category", "Quantity": "float32", "Action": "category"
+    })
+    transactions_df['Date'] = pd.to_datetime(transactions_df['Date'])
+    # Amounts stay float64: monthly revenue sums would drift in float32.
+    payments_df = pd.DataFrame(pay_cols).astype({"Method": "category"})
+    payments_df['Date'] = pd.to_datetime(payments_df['Date'])
+    items = sorted(item_counts)
+    item_activity = pd.DataFrame({
+        "Item": items,
+        "Total_Quantity": [round(item_totals[item], 2) for item in items],
+        "Transaction_Count": [item_counts[item] for item in items]
+    }).sort_values("Transaction_Count", ascending=False, kind="stable")
+    return {"transactions": transactions_df, "item_activity": item_activity, "payments": payments_df}
+
+
+# Derived bookkeeping that saves rebuild on their own; backups and re-imports do not need it
+EXPORT_SKIP_FIELDS = frozenset({"_balance_checkpoint"})
+
+
+def _export_customers(include_internal: bool) -> List[Dict[str, Any]]:
+    """Customer records for export, without EXPORT_SKIP_FIELDS unless include_internal is set."""
+    customers = get_all_customers()
+    if include_internal:
+        return customers
+    return [{k: v for k, v in c.items() if k not in EXPORT_SKIP_FIELDS} for c in customers]
+
+
+@st.cache_resource(max_entries=2)
+def _customer_json_export(data_version: tuple, include_internal: bool = False) -> bytes:
+    """Full customer JSON export, serialized once per data version; export_date is when this snapshot was built."""
+    customers = _export_customers(include_internal)
+    return _json_dumps({
+        "export_date": dt.datetime.now().isoformat(),
+        "total_customers": len(customers),
+        "customers": customers
+    })
+
+
+@st.cache_resource(max_entries=2)
+def _customer_ndjson_export(data_version: tuple, include_internal: bool = False) -> bytes:
+    """Customer export as NDJSON: a header object, then one compact JSON line per customer."""
+    customers = _export_customers(include_internal)
+    buf = io.BytesIO()
+    header = {"export_date": dt.datetime.now().isoformat(), "total_customers": len(customers)}
+    buf.write(_json_dumps_line(header) + b"\n")
+    for c in customers:
+        buf.write(_json_dumps_line(c) + b"\n")
+    return buf.getvalue()
+
+
+@st.cache_resource(max_entries=1)
+def _financial_summary_columns(data_version: tuple) -> Dict[str, Any]:
+    """Per-customer financial summary columns behind the CSV and Parquet exports, built once per data version."""
+    customers = get_all_customers()
+    aggregates = _admin_aggregates(data_version)
+    balances, payment_summaries = aggregates["balances"], aggregates["payment_summaries"]
+    ids = [c['customer_id'] for c in customers]
+    current_balances = np.fromiter((balances[cid] for cid in ids), dtype=np.float64, count=len(ids))
+    return {
+        "Customer_ID": ids,
+        "Name": [c.get('name') for c in customers],
+        "Mobile": [c.get('mobile') for c in customers],
+        "Current_Balance": current_balances,
+        "Total_Paid": [payment_summaries[cid].approved_sum for cid in ids],
+        "Previous_Balance": [safe_float(c.get('previous_balance', 0)) for c in customers],
+        "Status": np.select([current_balances > 0, current_balances < 0], ["Dues", "Advance"], default="Clear")
+    }
 
-    final_balance = previous_balance_initial + total_rent_accrued - approved_payments_sum
-    return final_balance
+
+@st.cache_resource(max_entries=1)
+def _financial_summary_csv(data_version: tuple) -> str:
+    """Per-customer financial summary CSV, built once per data version."""
+    columns = _financial_summary_columns(data_version)
+    buf = io.StringIO()
+    # A plain csv.writer over the rows skips building a DataFrame just to format this small fixed table
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(
+        (cid, name, mobile, f"{current:.2f}", f"{paid:.2f}", f"{previous:.2f}", status)
+        for cid, name, mobile, current, paid, previous, status in zip(*columns.values())
+    )
+    return buf.getvalue()
+
+
+@st.cache_resource(max_entries=1)
+def _financial_summary_parquet(data_version: tuple) -> bytes:
+    """Per-customer financial summary as zstd-compressed Parquet, built once per data version."""
+    buf = io.BytesIO()
+    # Text columns may hold numbers (e.g. mobiles), which Arrow rejects in a mixed object column
+    frame = pd.DataFrame(_financial_summary_columns(data_version)).astype(
+        {"Customer_ID": "string", "Name": "string", "Mobile": "string"})
+    frame.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    return buf.getvalue()
+
+
+@st.cache_resource(max_entries=1)
+def _customer_statistics(data_version: tuple) -> tuple:
+    """Total customers, customers with an active rental and total transactions, per customer data version."""
+    customers = get_all_customers()
+    active_customers = sum(1 for c in customers if any(safe_float(tx.get('qty', 0)) > 0
+                                                       for tx in c.get('transactions', [])))
+    total_transactions = sum(len(c.get('transactions', [])) for c in customers)
+    return len(customers), active_customers, total_transactions
 
 
 # --- Enhanced Landing Page Components ---
@@ -626,8 +1250,8 @@ def display_contact_info():
         if company.get('upi_id'):
             st.markdown("**💳 Quick Payment via UPI:**")
             try:
-                qr_img_bytes = generate_qr_code(company.get('upi_id', ''), None, company.get('name', ''))
-                if qr_img_bytes and qr_img_bytes.getvalue():
+                qr_img_bytes = generate_qr_code_bytes(company.get('upi_id', ''), None, company.get('name', ''))
+                if qr_img_bytes:
                     st.image(qr_img_bytes, width=150, caption=f"Pay via UPI: {company.get('upi_id')}")
             except:
                 st.write(f"UPI ID: `{company.get('upi_id')}`")
@@ -639,9 +1263,7 @@ def display_statistics():
     if customers:
         st.markdown("### 📊 Our Track Record")
 
-        total_customers = len(customers)
-        active_customers = sum(1 for c in customers if any(tx.get('qty', 0) > 0 for tx in c.get('transactions', [])))
-        total_transactions = sum(len(c.get('transactions', [])) for c in customers)
+        total_customers, active_customers, total_transactions = _customer_statistics(_customer_data_version())
 
         col1, col2, col3, col4 = st.columns(4)
 
@@ -658,7 +1280,7 @@ def display_statistics():
 
 # --- PDF Generation (Enhanced) ---
 
-def generate_comprehensive_bill(customer: Dict[str, Any]) -> io.BytesIO:
+def generate_comprehensive_bill(customer: Dict[str, Any]) -> bytes:
     """Generate a comprehensive rental bill with enhanced formatting."""
     try:
         pdf = FPDF()
@@ -708,43 +1330,44 @@ def generate_comprehensive_bill(customer: Dict[str, Any]) -> io.BytesIO:
         pdf.set_text_color(44, 62, 80)
         pdf.cell(0, 10, "TRANSACTION HISTORY", 0, 1)
 
-        # Table header with colors
-        pdf.set_fill_color(52, 152, 219)
-        pdf.set_text_color(255, 255, 255)
-        pdf.set_font("helvetica", "B", 10)
-
-        pdf.cell(35, 8, "Date", 1, 0, 'C', True)
-        pdf.cell(60, 8, "Item", 1, 0, 'C', True)
-        pdf.cell(25, 8, "Quantity", 1, 0, 'C', True)
-        pdf.cell(35, 8, "Rate/Day", 1, 0, 'C', True)
-        pdf.cell(35, 8, "Action", 1, 1, 'C', True)
-
-        # Table rows
-        pdf.set_fill_color(245, 245, 245)
+        # Table body font; the heading row gets its own style below
         pdf.set_text_color(0, 0, 0)
         pdf.set_font("helvetica", "", 9)
 
         transactions = customer.get("transactions", [])
         item_rates = {item[0]: safe_float(item[1]) for item in customer.get("items", [])}
 
-        for i, tx in enumerate(sorted(transactions, key=lambda x: x.get("date", ""))):
-            fill = i % 2 == 0
-            action = "Returned" if safe_float(tx.get("qty", 0)) < 0 else "Rented"
-            rate = item_rates.get(tx.get("item", ""), 0)
-
-            pdf.cell(35, 7, format_date(tx.get("date")), 1, 0, 'C', fill)
-            pdf.cell(60, 7, tx.get("item", "")[:25], 1, 0, 'L', fill)
-            pdf.cell(25, 7, str(abs(int(safe_float(tx.get("qty", 0))))), 1, 0, 'C', fill)
-            pdf.cell(35, 7, f"₹{rate:.2f}", 1, 0, 'C', fill)
-            pdf.cell(35, 7, action, 1, 1, 'C', fill)
+        rate_labels = {item: f"₹{rate:.2f}" for item, rate in item_rates.items()}
+
+        # Build every row's cell text up front so the render loop only emits cells.
+        rows = []
+        _sf = safe_float
+        for tx in sorted(transactions, key=lambda x: x.get("date", "")):
+            item = tx.get("item", "")
+            qty = _sf(tx.get("qty", 0))
+            rows.append((
+                format_date(tx.get("date")),
+                item[:25],
+                str(abs(int(qty))),
+                rate_labels.get(item, "₹0.00"),
+                "Returned" if qty < 0 else "Rented"
+            ))
+
+        with pdf.table(width=190, col_widths=(35, 60, 25, 35, 35), line_height=7,
+                       text_align=("CENTER", "LEFT", "CENTER", "CENTER", "CENTER"),
+                       headings_style=FontFace(emphasis="BOLD", color=(255, 255, 255), fill_color=(52, 152, 219),
+                                                size_pt=10),
+                       cell_fill_color=(245, 245, 245), cell_fill_mode="ROWS") as table:
+            table.row(("Date", "Item", "Quantity", "Rate/Day", "Action"))
+            for row in rows:
+                table.row(row)
 
         pdf.ln(5)
 
         # Financial summary
         current_balance = calculate_customer_balance(customer)
         previous_balance = safe_float(customer.get("previous_balance", 0))
-        payments_received = sum(safe_float(p.get("amount", 0)) for p in customer.get("payment_history", []) if
-                                p.get("status") == "approved")
+        payments_received = _partition_payments(customer.get("payment_history", [])).approved_sum
         total_rent = current_balance - previous_balance + payments_received
 
         # Summary box
@@ -755,17 +1378,16 @@ def generate_comprehensive_bill(customer: Dict[str, Any]) -> io.BytesIO:
         pdf.set_text_color(44, 62, 80)
         pdf.cell(0, 8, "PAYMENT SUMMARY", 0, 1, "R")
 
+        summary_lines = (f"Previous Balance: ₹{previous_balance:.2f}\n"
+                         f"Rental Charges: ₹{total_rent:.2f}\n"
+                         f"Payments Received: ₹{payments_received:.2f}")
         pdf.set_font("helvetica", "", 10)
-        pdf.cell(120, 6, "", 0, 0)
-        pdf.cell(70, 6, f"Previous Balance: ₹{previous_balance:.2f}", 0, 1, "R")
-        pdf.cell(120, 6, "", 0, 0)
-        pdf.cell(70, 6, f"Rental Charges: ₹{total_rent:.2f}", 0, 1, "R")
-        pdf.cell(120, 6, "", 0, 0)
-        pdf.cell(70, 6, f"Payments Received: ₹{payments_received:.2f}", 0, 1, "R")
+        pdf.set_x(pdf.l_margin + 120)
+        pdf.multi_cell(70, 6, summary_lines, 0, "R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
         pdf.set_font("helvetica", "B", 12)
         pdf.set_text_color(231, 76, 60)
-        pdf.cell(120, 8, "", 0, 0)
+        pdf.set_x(pdf.l_margin + 120)
         pdf.cell(70, 8, f"Amount Due: ₹{current_balance:.2f}", 1, 1, "R")
 
         pdf.ln(10)
@@ -776,13 +1398,9 @@ def generate_comprehensive_bill(customer: Dict[str, Any]) -> io.BytesIO:
             pdf.set_text_color(44, 62, 80)
             pdf.cell(0, 8, "QUICK PAYMENT", 0, 1, "C")
 
-            qr_img_bytes = generate_qr_code(company.get('upi_id', ''), current_balance, company.get('name', ''))
-            if qr_img_bytes and qr_img_bytes.getvalue():
-                qr_img = Image.open(qr_img_bytes)
-                qr_path = "temp_qr.png"
-                qr_img.save(qr_path)
-                pdf.image(qr_path, x=pdf.w / 2 - 25, w=50)
-                os.remove(qr_path)
+            qr_img_bytes = generate_qr_code_bytes(company.get('upi_id', ''), current_balance, company.get('name', ''))
+            if qr_img_bytes:
+                pdf.image(io.BytesIO(qr_img_bytes), x=pdf.w / 2 - 25, w=50)
 
             pdf.ln(35)
             pdf.set_font("helvetica", "", 10)
@@ -796,15 +1414,348 @@ def generate_comprehensive_bill(customer: Dict[str, Any]) -> io.BytesIO:
         pdf.cell(0, 5, "This is a computer-generated bill. No signature required.", 0, 1, "C")
         pdf.cell(0, 5, f"Generated on: {dt.datetime.now().strftime('%d-%b-%Y %H:%M:%S')}", 0, 1, "C")
 
-        # Save to bytes buffer
-        pdf_bytes = io.BytesIO()
-        pdf.output(pdf_bytes)
-        pdf_bytes.seek(0)
-        return pdf_bytes
+        return bytes(pdf.output())
 
     except Exception as e:
         logger.error(f"Error generating comprehensive bill: {str(e)}")
-        return io.BytesIO()
+        return b""
+
+
+@st.fragment
+def display_rental_history(tx_df: pd.DataFrame):
+    """Render the filterable transaction table; filter changes rerun only this fragment."""
+    # Enhanced transaction display with filters
+    col1, col2 = st.columns(2)
+    with col1:
+        item_filter = st.selectbox(
+            "Filter by Item",
+            ["All Items"] + tx_df["item"].unique().tolist(),
+            key="item_filter"
+        )
+    with col2:
+        date_range = st.date_input(
+            "Date Range",
+            value=(dt.date.today() - dt.timedelta(days=30), dt.date.today()),
+            key="date_range"
+        )
+
+    # Filter transactions
+    filtered_df = tx_df
+    if item_filter != "All Items":
+        filtered_df = filtered_df[filtered_df["item"] == item_filter]
+
+    if len(date_range) == 2:
+        start_date, end_date = date_range
+        filtered_df = filtered_df[filtered_df["Date"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+
+    filtered_df = filtered_df.sort_values("Date", ascending=False, kind="stable")
+    tx_df_data = pd.DataFrame({
+        "Date": filtered_df["date"].map(format_date),
+        "Item": filtered_df["item"],
+        "Action": np.where(filtered_df["qty"] < 0, "🔴 Returned", "🟢 Rented"),
+        "Quantity": filtered_df["qty"].abs().astype(int)
+    })
+
+    if not tx_df_data.empty:
+        st.dataframe(tx_df_data, hide_index=True, use_container_width=True)
+    else:
+        st.info("No transactions found for the selected filters.")
+
+
+APPROVALS_PAGE_SIZE = 25
+
+
+@st.fragment
+def display_pending_approvals(all_pending: List[Dict[str, Any]]):
+    """Render one page of per-payment approve/reject cards as an isolated fragment."""
+    page_count = max(1, math.ceil(len(all_pending) / APPROVALS_PAGE_SIZE))
+    # Clamp in case approvals elsewhere shrank the list since the page was chosen
+    page = min(st.session_state.get('approval_page', 0), page_count - 1)
+    st.session_state.approval_page = page
+    start = page * APPROVALS_PAGE_SIZE
+
+    for item in all_pending[start:start + APPROVALS_PAGE_SIZE]:
+        customer = item['customer']
+        payment = item['payment']
+        balance = item['customer_balance']
+
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([3, 2, 2])
+
+            with col1:
+                st.markdown(f"**👤 {customer['name']}** (`{customer['customer_id']}`)")
+                st.markdown(f"**💰 Amount:** {format_currency(payment.get('amount', 0.0))}")
+                st.markdown(f"**📅 Date:** {format_date(payment['date'])}")
+
+            with col2:
+                st.markdown(f"**💳 Method:** {payment.get('method', 'N/A')}")
+                if payment.get('reference'):
+                    st.markdown(f"**🔖 Ref:** `{payment['reference']}`")
+                st.markdown(f"**⚖️ Current Balance:** {format_currency(balance)}")
+
+            with col3:
+                # Calculate balance after payment
+                balance_after = balance - payment.get('amount', 0.0)
+                if balance_after <= 0:
+                    st.success(f"✅ Will clear dues")
+                else:
+                    st.info(f"📊 Remaining: {format_currency(balance_after)}")
+
+                col3a, col3b = st.columns(2)
+                with col3a:
+                    if st.button("✅", key=f"approve_{payment['id']}", use_container_width=True, type="primary"):
+                        payment['status'] = 'approved'
+                        payment['approved_by'] = 'admin'
+                        payment['approved_at'] = dt.datetime.now().isoformat()
+                        if save_customer_data(customer):
+                            st.success(f"✅ Payment approved for {customer['name']}")
+                            st.rerun()
+
+                with col3b:
+                    if st.button("❌", key=f"reject_{payment['id']}", use_container_width=True):
+                        payment['status'] = 'rejected'
+                        payment['rejected_by'] = 'admin'
+                        payment['rejected_at'] = dt.datetime.now().isoformat()
+                        if save_customer_data(customer):
+                            st.warning(f"❌ Payment rejected for {customer['name']}")
+                            st.rerun()
+
+            # Show notes if any
+            if payment.get('notes'):
+                st.markdown(f"**📝 Notes:** {payment['notes']}")
+
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("◀ Previous", disabled=page == 0, use_container_width=True,
+                      on_click=lambda: st.session_state.update(approval_page=page - 1))
+        with col_page:
+            st.caption(f"Page {page + 1} of {page_count} · showing {start + 1}-"
+                       f"{min(start + APPROVALS_PAGE_SIZE, len(all_pending))} of {len(all_pending)}")
+        with col_next:
+            st.button("Next ▶", disabled=page >= page_count - 1, use_container_width=True,
+                      on_click=lambda: st.session_state.update(approval_page=page + 1))
+
+
+@st.fragment
+def display_financial_report(customers: List[Dict[str, Any]], balances: Dict[str, float],
+                             payment_summaries: Dict[str, PaymentSummary]):
+    """Render the financial overview and the outstanding balances report."""
+    st.markdown("#### 💰 Financial Overview")
+
+    # Financial metrics and the outstanding list in a single pass over customers
+    total_outstanding = total_advances = total_received = 0.0
+    outstanding_customers = []
+    for c in customers:
+        cid = c['customer_id']
+        balance = balances[cid]
+        summary = payment_summaries[cid]
+        total_received += summary.approved_sum
+        if balance > 0:
+            total_outstanding += balance
+            outstanding_customers.append({
+                "Customer": c.get('name'),
+                "ID": cid,
+                "Mobile": c.get('mobile'),
+                "Outstanding": balance,
+                "Last_Payment": summary.latest_approved_date
+            })
+        elif balance < 0:
+            total_advances -= balance
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💰 Total Outstanding", format_currency(total_outstanding))
+    with col2:
+        st.metric("💎 Total Advances", format_currency(total_advances))
+    with col3:
+        st.metric("📈 Total Received", format_currency(total_received))
+    with col4:
+        net_position = total_received - total_outstanding + total_advances
+        st.metric("🏦 Net Position", format_currency(net_position))
+
+    # Outstanding balances report
+    st.markdown("#### 📋 Outstanding Balances Report")
+
+    if outstanding_customers:
+        outstanding_df = pd.DataFrame(outstanding_customers)
+        last_paid = pd.to_datetime(outstanding_df['Last_Payment'], format='%Y-%m-%d', errors='coerce')
+        outstanding_df['Days_Since_Last_Payment'] = (
+            (pd.Timestamp.today().normalize() - last_paid).dt.days.fillna(9999).astype("int32")
+        )
+        outstanding_df_display = outstanding_df[
+            ['Customer', 'ID', 'Mobile', 'Outstanding', 'Days_Since_Last_Payment']].copy()
+        outstanding_df_display.columns = ['Customer', 'ID', 'Mobile', 'Outstanding', 'Days Since Last Payment']
+
+        # Amounts stay numeric so the column sorts by value; Streamlit formats them client-side
+        st.dataframe(outstanding_df_display, use_container_width=True, hide_index=True, column_config={
+            "Outstanding": st.column_config.NumberColumn(format="₹ %.2f")
+        })
+
+        # Export option
+        csv_data = outstanding_df_display.to_csv(index=False)
+        st.download_button(
+            "📥 Download Outstanding Report (CSV)",
+            csv_data,
+            f"outstanding_report_{dt.date.today().strftime('%Y%m%d')}.csv",
+            "text/csv",
+            use_container_width=True
+        )
+    else:
+        st.success("🎉 No outstanding balances! All customers are up to date.")
+
+
+@st.fragment
+def display_customer_analytics(customers: List[Dict[str, Any]], balances: Dict[str, float],
+                               payment_summaries: Dict[str, PaymentSummary]):
+    """Render the balance/activity charts and the top customers table."""
+    st.markdown("#### 👥 Customer Analytics")
+
+    if customers:
+        # Balance and activity distributions in a single pass over customers
+        balance_categories = {"Dues": 0, "Clear": 0, "Advance": 0}
+        active_customers = 0
+        for c in customers:
+            balance = balances[c['customer_id']]
+            if balance > 0:
+                balance_categories["Dues"] += 1
+            elif balance < 0:
+                balance_categories["Advance"] += 1
+            else:
+                balance_categories["Clear"] += 1
+            if c.get('transactions'):
+                active_customers += 1
+
+        # Customer distribution charts
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig_balance = _pie_chart(
+                tuple(balance_categories.values()),
+                tuple(balance_categories.keys()),
+                title="Customer Balance Distribution"
+            )
+            st.plotly_chart(fig_balance, use_container_width=True)
+
+        with col2:
+            # Activity distribution
+            inactive_customers = len(customers) - active_customers
+
+            fig_activity = _pie_chart(
+                (active_customers, inactive_customers),
+                ("Active", "Inactive"),
+                title="Customer Activity Status"
+            )
+            st.plotly_chart(fig_activity, use_container_width=True)
+
+        # Top customers analysis
+        st.markdown("#### 🏆 Top Customers Analysis")
+
+        # Top by payments; rows are only built for the ten customers kept
+        top_customers = heapq.nlargest(10, customers, key=lambda c: payment_summaries[c['customer_id']].approved_sum)
+        top_payers = [{
+            "Name": c.get('name'),
+            "ID": c['customer_id'],
+            "Total_Paid": payment_summaries[c['customer_id']].approved_sum,
+            "Transactions": len(c.get("transactions", [])),
+            "Current_Balance": balances[c['customer_id']]
+        } for c in top_customers]
+        if top_payers:
+            st.markdown("##### 💰 Top 10 Customers by Total Payments")
+            top_payers_df = pd.DataFrame(top_payers)
+            st.dataframe(
+                top_payers_df[['Name', 'ID', 'Total_Paid', 'Transactions']].rename(columns={
+                    'Total_Paid': 'Total Paid',
+                    'Transactions': 'Total Transactions'
+                }),
+                use_container_width=True,
+                hide_index=True,
+                column_config={"Total Paid": st.column_config.NumberColumn(format="₹ %.2f")}
+            )
+
+
+@st.fragment
+def display_transaction_report(transactions_df: pd.DataFrame, item_activity: pd.DataFrame):
+    """Render transaction volume, popular items and recent activity."""
+    st.markdown("#### 📊 Transaction Analysis")
+
+    if not transactions_df.empty:
+        # Transaction volume over time
+        st.markdown("##### 📈 Transaction Volume Trend")
+        daily_transactions = transactions_df.groupby(transactions_df['Date'].dt.date).size().reset_index(
+            name='Count')
+        daily_transactions['Date'] = pd.to_datetime(daily_transactions['Date'])
+
+        fig_volume = _xy_chart('line', daily_transactions, x='Date', y='Count', title='Daily Transaction Volume')
+        st.plotly_chart(fig_volume, use_container_width=True)
+
+        # Most popular items
+        st.markdown("##### 🏗️ Most Popular Items")
+        if not item_activity.empty:
+            st.dataframe(
+                item_activity.rename(columns={
+                    'Item': 'Item Name',
+                    'Total_Quantity': 'Net Quantity',
+                    'Transaction_Count': 'Total Transactions'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        # Recent activity
+        st.markdown("##### 🕒 Recent Transaction Activity")
+        recent_display = transactions_df.nlargest(20, 'Date')
+        recent_display['Date'] = recent_display['Date'].dt.strftime('%Y-%m-%d')
+        recent_display['Quantity'] = recent_display['Quantity'].abs().astype(int)
+
+        st.dataframe(
+            recent_display[['Date', 'Customer', 'Item', 'Action', 'Quantity']],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("📋 No transaction data available for analysis.")
+
+
+@st.fragment
+def display_trends_report(payments_df: pd.DataFrame):
+    """Render the monthly revenue, payment method and growth trends."""
+    st.markdown("#### 📈 Business Trends")
+
+    # Payment trends
+    if not payments_df.empty:
+        # Monthly revenue trend
+        st.markdown("##### 💰 Monthly Revenue Trend")
+        monthly_revenue = payments_df.set_index('Date')['Amount'].resample('MS').sum().reset_index()
+
+        fig_revenue = _xy_chart('bar', monthly_revenue, x='Date', y='Amount', title='Monthly Revenue',
+                                layout={"xaxis_title": "Month", "yaxis_title": "Revenue (₹)",
+                                        "xaxis_tickformat": "%b %Y"})
+        st.plotly_chart(fig_revenue, use_container_width=True)
+
+        # Payment method trends
+        st.markdown("##### 💳 Payment Method Preferences")
+        method_trends = payments_df['Method'].value_counts().reset_index()
+        method_trends.columns = ['Method', 'Count']
+
+        fig_methods = _xy_chart('bar', method_trends, x='Method', y='Count', title='Payment Methods Usage')
+        st.plotly_chart(fig_methods, use_container_width=True)
+
+        # Growth metrics
+        if len(monthly_revenue) > 1:
+            current_month = monthly_revenue['Amount'].iloc[-1]
+            previous_month = monthly_revenue['Amount'].iloc[-2]
+            growth_rate = ((current_month - previous_month) / previous_month * 100) if previous_month > 0 else 0
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("This Month", format_currency(current_month))
+            with col2:
+                st.metric("Last Month", format_currency(previous_month))
+            with col3:
+                st.metric("Growth Rate", f"{growth_rate:.1f}%", delta=f"{growth_rate:.1f}%")
+    else:
+        st.info("📊 No payment data available for trend analysis.")
 
 
 # --- Streamlit App Initialization ---
@@ -813,6 +1764,10 @@ if not initialize_directories():
     st.stop()
 
 company = load_company_settings()
+SETTINGS = CompanySettings.from_dict(company)
+# Evaluated once per script run, so every section of a rerun agrees on the date
+TODAY = dt.date.today()
+TODAY_STAMP = TODAY.strftime("%Y%m%d")
 
 st.set_page_config(
     page_title=f"{company['name']} - Portal",
@@ -823,7 +1778,7 @@ st.set_page_config(
 
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -862,7 +1817,86 @@ st.markdown("""
         border: 1px solid #dee2e6;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Hides Streamlit's own header and menu chrome on customer-facing pages.
+HIDE_STREAMLIT_STYLE = """
+<style>
+MainMenu {visibility: hidden;}
+headerNoPadding {visibility: hidden;}
+_terminalButton_rix23_138 {visibility: hidden;}
+header {visibility: hidden;}
+</style>
+"""
+
+# Landing page "How It Works" cards: (background, border, title colour, title, text)
+_HOW_IT_WORKS_STEPS = [
+    ("#FFEEEE", "#FF6B6B", "#D32F2F", "1️⃣ Register or login", "Get your customer account set up with our team"),
+    ("#EEFFEE", "#4CAF50", "#2E7D32", "2️⃣ Rent Equipment", "Choose from our wide range of quality shuttering materials"),
+    ("#EEEEFF", "#4285F4", "#1565C0", "3️⃣ Track Usage", "Monitor your rentals and payments through our digital portal"),
+    ("#FFF5EE", "#FFA726", "#E65100", "4️⃣ Easy Payments", "Pay online via UPI, bank transfer, or traditional methods"),
+]
+HOW_IT_WORKS_CARDS = [f"""
+<div style="
+    background-color: {background};
+    padding: 20px;
+    border-radius: 10px;
+    border-left: 5px solid {border};
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    margin: 10px 0;
+">
+    <h4 style="color: {text_color}; margin-top: 0;">{title}</h4>
+    <p style="color: #555555;">{text}</p>
+</div>
+""" for background, border, text_color, title, text in _HOW_IT_WORKS_STEPS]
+# One grid holds all cards so the section is a single markdown element; auto-fit wraps them on narrow screens
+HOW_IT_WORKS_HTML = ('<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); '
+                     'gap: 1rem;">' + "".join(HOW_IT_WORKS_CARDS) + '</div>')
+
+# Only the phone number varies, so the template is filled with str.format per render
+CALL_TO_ACTION_HTML = """
+<div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 10px;">
+    <h3>Ready to Get Started?</h3>
+    <p style="margin-bottom: 1.5rem;">Join hundreds of satisfied customers who trust us with their construction needs.</p>
+    <p><strong>📞 Call us at {}</strong></p>
+    <p>or use the sidebar to access your existing account</p>
+</div>
+"""
+
+SYSTEM_SECTIONS = ["🧹 Maintenance", "📊 System Stats", "🔄 Data Management", "🆘 Support"]
+
+SUPPORT_INFO_MD = """
+**📋 System Information:**
+- Application Version: 2.0.0 Enhanced
+- Python Version: 3.8+
+- Streamlit Version: Latest
+- Last Updated: {}
+
+**🔧 Technical Support:**
+- For technical issues, please contact your system administrator
+- Check logs directory for detailed error information
+- Ensure all required directories have proper permissions
+
+**📚 User Guide:**
+- Customer Portal: Login → View balance, history, make payments
+- Admin Panel: Manage customers, approve payments, generate reports
+- System maintains automatic backups of all data
+
+**🚨 Emergency Procedures:**
+- In case of data corruption, check the data directory
+- Sessions can be safely cleared without data loss
+- Settings can be reset to defaults if needed
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; padding: 1rem; color: #7F8C8D; font-size: 0.9em;">
+    <p>© {} {} | 
+    created by Sahil Jammu | Beta Version 1.0.0 </p>
+    <p>🏗️ Professional Rental Management Solutions</p>
+</div>
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 if 'session_cleanup_done' not in st.session_state:
     cleanup_count = cleanup_expired_sessions()
@@ -885,6 +1919,8 @@ def initialize_streamlit_session_state():
 
 initialize_streamlit_session_state()
 
+# Customer record fetched while re-establishing the session, reused by the main area on the same run.
+refreshed_customer = None
 if not st.session_state.initial_load_done:
     if st.session_state.session_id:
         session_data_refreshed = get_session(st.session_state.session_id)
@@ -894,6 +1930,7 @@ if not st.session_state.initial_load_done:
                 latest_customer_data = authenticate_customer(st.session_state.user_data.get("customer_id"))
                 if latest_customer_data:
                     st.session_state.user_data = latest_customer_data
+                    refreshed_customer = latest_customer_data
                 else:
                     st.session_state.session_id = None
                     st.session_state.user_type = None
@@ -918,7 +1955,7 @@ if not st.session_state.initial_load_done:
 
 if st.session_state.user_type == "customer":
     customer_id_in_session = st.session_state.user_data.get("customer_id")
-    customer = authenticate_customer(customer_id_in_session)
+    customer = refreshed_customer or authenticate_customer(customer_id_in_session)
     if not customer:
         st.error("Your data could not be loaded. Please log in again.")
         st.session_state.session_id = None
@@ -926,41 +1963,38 @@ if st.session_state.user_type == "customer":
         st.session_state.user_data = None
         time.sleep(0.5)
         st.rerun()
+    payments = _partition_payments(customer.get("payment_history", []))
+    tx_df = _transactions_frame(customer.get("transactions", []))
+    # Computed once per render and reused by the dashboard, payment tab and sidebar.
+    customer_balance = calculate_customer_balance(customer)
+    balance_display = format_currency(customer_balance)
+    advance_display = format_currency(abs(customer_balance))
 
     st.markdown(f"# 👋 Welcome, {customer.get('name', 'Customer')}")
     st.markdown(f"**Customer ID:** `{customer.get('customer_id', 'N/A')}`")
     st.markdown("---")
-    hide_st_style = """
-                    <style>
-                    MainMenu {visibility: hidden;}
-                    headerNoPadding {visibility: hidden;}
-                    _terminalButton_rix23_138 {visibility: hidden;}
-                    header {visibility: hidden;}
-                    </style>
-                    """
-    st.markdown(hide_st_style, unsafe_allow_html=True)
+    st.markdown(HIDE_STREAMLIT_STYLE, unsafe_allow_html=True)
 
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "📋 Rental History", "💳 Payments", "💰 Make Payment"])
 
     with tab1:
         st.subheader("Account Summary")
         try:
-            current_balance = calculate_customer_balance(customer)
-            payment_received = sum(safe_float(p.get("amount", 0)) for p in customer.get("payment_history", []) if
-                                   p.get("status") == "approved")
+            current_balance = customer_balance
+            payment_received = payments.approved_sum
             
             if current_balance > 0:
                 # Enhanced balance display
                 col1, col2 = st.columns(2)
                 with col1:
                     if current_balance > 0:
-                        st.error(f"💰 Outstanding Balance: {format_currency(current_balance)}")
+                        st.error(f"💰 Outstanding Balance: {balance_display}")
                         st.caption("⚠️ Payment required to clear dues")
                     elif current_balance == 0:
                         st.success("✅ No Outstanding Dues")
                         st.caption("🎉 Your account is clear!")
                     else:
-                        st.info(f"💰 Advance Balance: {format_currency(abs(current_balance))}")
+                        st.info(f"💰 Advance Balance: {advance_display}")
                         st.caption("💎 You have credit in your account")
 
 
@@ -976,12 +2010,8 @@ if st.session_state.user_type == "customer":
                 amount = max(0.0, current_balance) if current_balance > 0 else None
                 tn = f"Payment for {customer.get('customer_id', '')}"
                 
-                upi_url = f"upi://pay?pa={upi_id}&pn={company_name.replace(' ', '%20')}"
-                if amount:
-                    upi_url += f"&am={amount:.2f}"
-                upi_url += "&cu=INR"
-                if tn:
-                    upi_url += f"&tn={tn.replace(' ', '%20')}"
+                upi_url = build_upi_url(upi_id, company_name, amount, tn)
+                qr_img_bytes = generate_qr_code_bytes(upi_id, amount, company_name) if upi_id else b""
 
                 col1, col2 = st.columns([3, 2])
 
@@ -990,7 +2020,7 @@ if st.session_state.user_type == "customer":
                     **🚀 Fast UPI Payment Steps:**
                     1. Open any UPI app (Google Pay, PhonePe, Paytm, etc.)
                     2. Scan the QR code or click the payment button below
-                    3. Verify amount: **{format_currency(amount) if amount else 'Enter Manually'}**
+                    3. Verify amount: **{balance_display if amount else 'Enter Manually'}**
                     4. Complete payment and note the transaction ID
                     5. Submit payment details using the form above
 
@@ -998,7 +2028,7 @@ if st.session_state.user_type == "customer":
                     """)
 
                     if current_balance > 0:
-                        st.info(f"💰 **Recommended Payment:** {format_currency(current_balance)} (clears all dues)")
+                        st.info(f"💰 **Recommended Payment:** {balance_display} (clears all dues)")
                         
                         # Add UPI payment button
                         st.markdown(f"""
@@ -1022,8 +2052,7 @@ if st.session_state.user_type == "customer":
                 with col2:
                     if company.get('upi_id'):
                         try:
-                            qr_img_bytes = generate_qr_code(upi_id, amount, company_name)
-                            if qr_img_bytes and qr_img_bytes.getvalue():
+                            if qr_img_bytes:
                                 st.image(qr_img_bytes, width=200,
                                         caption=f"Scan to pay via UPI")
                                 st.code(f"UPI ID: {upi_id}", language=None)
@@ -1033,7 +2062,7 @@ if st.session_state.user_type == "customer":
                                 st.markdown(f"""
                                 - **UPI ID:** `{upi_id}`
                                 - **Payee Name:** {company_name}
-                                - **Amount:** {format_currency(amount) if amount else 'Variable'}
+                                - **Amount:** {balance_display if amount else 'Variable'}
                                 - **Note:** {tn}
                                 """)
                             else:
@@ -1051,53 +2080,47 @@ if st.session_state.user_type == "customer":
                     balance_color = "inverse"
                 elif current_balance < 0:
                     balance_color = "off"
-                st.metric("Current Balance", format_currency(current_balance),
+                st.metric("Current Balance", balance_display,
                           delta_color=balance_color)
             with col2:
                 st.metric("Total Paid (Approved)", format_currency(payment_received))
             with col3:
-                approved_payments = [p for p in customer.get("payment_history", []) if p.get("status") == "approved"]
                 last_payment_date_display = "Never"
-                if approved_payments:
-                    latest_payment = max(approved_payments, key=lambda p: p.get("date", "1900-01-01"))
-                    last_payment_date_display = format_date(latest_payment.get("date", ""))
+                if payments.latest_approved_date is not None:
+                    last_payment_date_display = format_date(payments.latest_approved_date)
                 st.metric("Last Approved Payment", last_payment_date_display)
 
-            # Balance trend chart
-            if len(customer.get("payment_history", [])) > 1:
+            # Balance trend chart; short histories get an inline sparkline instead of a Plotly figure
+            if len(payments.approved) >= TREND_CHART_MIN_POINTS:
                 st.subheader("Payment History Trend")
                 payments_df = pd.DataFrame([
-                    {"Date": p.get("date"), "Amount": safe_float(p.get("amount", 0))}
-                    for p in customer.get("payment_history", []) if p.get("status") == "approved"
+                    {"Date": p.get("date"), "Amount": p.get("amount", 0.0)}
+                    for p in payments.approved
                 ])
-                if not payments_df.empty:
-                    payments_df["Date"] = pd.to_datetime(payments_df["Date"])
-                    fig = px.line(payments_df, x="Date", y="Amount",
-                                  title="Payment History", markers=True)
-                    fig.update_layout(height=300)
-                    st.plotly_chart(fig, use_container_width=True)
+                payments_df["Date"] = pd.to_datetime(payments_df["Date"])
+                fig = _xy_chart("line", payments_df, x="Date", y="Amount", title="Payment History",
+                                layout={"height": 300}, markers=True)
+                st.plotly_chart(fig, use_container_width=True, config={"staticPlot": True})
+            elif len(payments.approved) > 1:
+                st.subheader("Payment History Trend")
+                amounts = [p.get("amount", 0.0) for p in payments.approved]
+                st.markdown(_sparkline_svg(amounts), unsafe_allow_html=True)
 
             st.subheader("Currently Rented Items")
-            in_hand_quantities = {}
-            for tx in customer.get("transactions", []):
-                in_hand_quantities[tx.get("item")] = in_hand_quantities.get(tx.get("item"), 0) + safe_float(
-                    tx.get("qty", 0))
-
-            rented_items = [(item, qty) for item, qty in in_hand_quantities.items() if qty > 0]
-            if not rented_items:
+            in_hand_quantities = tx_df.groupby("item", sort=False)["qty"].sum()
+            rented_items = in_hand_quantities[in_hand_quantities > 0]
+            if rented_items.empty:
                 st.info("📋 No rental items currently in your possession.")
             else:
-                df_data = []
                 item_daily_rents = {item[0]: safe_float(item[1]) for item in customer.get("items", [])}
-                for item, qty in rented_items:
-                    daily_rent = item_daily_rents.get(item, 0.0)
-                    df_data.append({
-                        "Item": item,
-                        "Quantity": int(qty),
-                        "Daily Rent": format_currency(daily_rent),
-                        "Total/Day": format_currency(qty * daily_rent)
-                    })
-                st.dataframe(pd.DataFrame(df_data), hide_index=True, use_container_width=True)
+                daily_rents = rented_items.index.map(item_daily_rents).fillna(0.0).to_numpy(dtype=np.float64)
+                rented_df = pd.DataFrame({
+                    "Item": rented_items.index,
+                    "Quantity": rented_items.to_numpy().astype(int),
+                    "Daily Rent": [format_currency(rent) for rent in daily_rents],
+                    "Total/Day": [format_currency(total) for total in rented_items.to_numpy() * daily_rents]
+                })
+                st.dataframe(rented_df, hide_index=True, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading dashboard: {str(e)}")
 
@@ -1107,60 +2130,18 @@ if st.session_state.user_type == "customer":
         if not transactions:
             st.info("📋 No rental history found.")
         else:
-            # Enhanced transaction display with filters 
-            col1, col2 = st.columns(2)
-            with col1:
-                item_filter = st.selectbox(
-                    "Filter by Item",
-                    ["All Items"] + list(set(tx.get("item", "") for tx in transactions)),
-                    key="item_filter"
-                )
-            with col2:
-                date_range = st.date_input(
-                    "Date Range",
-                    value=(dt.date.today() - dt.timedelta(days=30), dt.date.today()),
-                    key="date_range"
-                )
-
-            # Filter transactions
-            filtered_transactions = transactions
-            if item_filter != "All Items":
-                filtered_transactions = [tx for tx in transactions if tx.get("item") == item_filter]
-
-            if len(date_range) == 2:
-                start_date, end_date = date_range
-                filtered_transactions = [
-                    tx for tx in filtered_transactions
-                    if start_date <= dt.datetime.strptime(tx.get("date", "1900-01-01"), "%Y-%m-%d").date() <= end_date
-                ]
-
-            tx_df_data = []
-            sorted_transactions = sorted(filtered_transactions, key=lambda x: x.get("date", "1900-01-01"), reverse=True)
-            for tx in sorted_transactions:
-                action = "🔴 Returned" if safe_float(tx.get("qty")) < 0 else "🟢 Rented"
-                tx_df_data.append({
-                    "Date": format_date(tx.get("date")),
-                    "Item": tx.get("item"),
-                    "Action": action,
-                    "Quantity": abs(int(safe_float(tx.get("qty"))))
-                })
-
-            if tx_df_data:
-                df = pd.DataFrame(tx_df_data)
-                st.dataframe(df, hide_index=True, use_container_width=True)
-            else:
-                st.info("No transactions found for the selected filters.")
+            display_rental_history(tx_df)
 
             # Enhanced Bill Generation
             if st.button("📄 Generate Comprehensive Rental Bill PDF", use_container_width=True, type="primary"):
                 try:
                     with st.spinner("Generating comprehensive bill..."):
                         pdf_bytes = generate_comprehensive_bill(customer)
-                        if pdf_bytes and pdf_bytes.getvalue():
+                        if pdf_bytes:
                             st.download_button(
                                 "📥 Download Comprehensive Bill",
                                 pdf_bytes,
-                                f"Comprehensive_Bill_{customer.get('customer_id', '')}_{dt.date.today().strftime('%Y%m%d')}.pdf",
+                                f"Comprehensive_Bill_{customer.get('customer_id', '')}_{TODAY_STAMP}.pdf",
                                 "application/pdf",
                                 use_container_width=True
                             )
@@ -1174,10 +2155,9 @@ if st.session_state.user_type == "customer":
         st.subheader("Payment History & Status")
 
         # Payment status overview
-        all_payments = customer.get("payment_history", [])
-        pending_payments = [p for p in all_payments if p.get("status") == "pending"]
-        approved_payments = [p for p in all_payments if p.get("status") == "approved"]
-        rejected_payments = [p for p in all_payments if p.get("status") == "rejected"]
+        pending_payments = payments.pending
+        approved_payments = payments.approved
+        rejected_payments = payments.rejected
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1193,7 +2173,7 @@ if st.session_state.user_type == "customer":
             pending_df_data = [
                 {
                     "Date": format_date(p.get("date")),
-                    "Amount": format_currency(safe_float(p.get('amount'))),
+                    "Amount": format_currency(p.get('amount', 0.0)),
                     "Method": p.get("method"),
                     "Reference": p.get("reference", "N/A"),
                     "Status": "⏳ Pending"
@@ -1207,7 +2187,7 @@ if st.session_state.user_type == "customer":
                 rejected_df_data = [
                     {
                         "Date": format_date(p.get("date")),
-                        "Amount": format_currency(safe_float(p.get('amount'))),
+                        "Amount": format_currency(p.get('amount', 0.0)),
                         "Method": p.get("method"),
                         "Reference": p.get("reference", "N/A"),
                         "Status": "❌ Rejected"
@@ -1218,11 +2198,11 @@ if st.session_state.user_type == "customer":
         if approved_payments:
             st.success("✅ Approved Payment History")
             payment_df_data = []
-            sorted_payments = sorted(approved_payments, key=lambda p: p.get("date", "1900-01-01"), reverse=True)
+            sorted_payments = approved_payments[::-1]
             for p in sorted_payments:
                 payment_df_data.append({
                     "Date": format_date(p.get("date")),
-                    "Amount": format_currency(safe_float(p.get('amount'))),
+                    "Amount": format_currency(p.get('amount', 0.0)),
                     "Method": p.get("method"),
                     "Reference": p.get("reference", "N/A"),
                     "Receipt No": p.get("id", "N/A")
@@ -1236,19 +2216,19 @@ if st.session_state.user_type == "customer":
         st.subheader("💰 Make a Payment")
 
         try:
-            current_balance = calculate_customer_balance(customer)
+            current_balance = customer_balance
 
             # Enhanced balance display
             col1, col2 = st.columns(2)
             with col1:
                 if current_balance > 0:
-                    st.error(f"💰 Outstanding Balance: {format_currency(current_balance)}")
+                    st.error(f"💰 Outstanding Balance: {balance_display}")
                     st.caption("⚠️ Payment required to clear dues")
                 elif current_balance == 0:
                     st.success("✅ No Outstanding Dues")
                     st.caption("🎉 Your account is clear!")
                 else:
-                    st.info(f"💰 Advance Balance: {format_currency(abs(current_balance))}")
+                    st.info(f"💰 Advance Balance: {advance_display}")
                     st.caption("💎 You have credit in your account")
 
             with col2:
@@ -1298,8 +2278,8 @@ if st.session_state.user_type == "customer":
 
                     payment_date = st.date_input(
                         "📅 Payment Date",
-                        value=dt.date.today(),
-                        max_value=dt.date.today()
+                        value=TODAY,
+                        max_value=TODAY
                     )
 
                 notes = st.text_area(
@@ -1313,10 +2293,11 @@ if st.session_state.user_type == "customer":
 
                 # Payment impact calculation
                 balance_after = current_balance - amount
+                amount_display = format_currency(amount)
 
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.info(f"💰 **Payment Amount:** {format_currency(amount)}")
+                    st.info(f"💰 **Payment Amount:** {amount_display}")
                     st.info(f"💳 **Method:** {method}")
                     if reference:
                         st.info(f"🔖 **Reference:** {reference}")
@@ -1371,7 +2352,7 @@ if st.session_state.user_type == "customer":
 
                                 if save_customer_data(customer):
                                     st.session_state.user_data = customer
-                                    st.success(f"🎉 Payment of {format_currency(amount)} submitted successfully!")
+                                    st.success(f"🎉 Payment of {amount_display} submitted successfully!")
                                     st.info(f"📋 Payment ID: `{payment_id}`")
                                     st.info(
                                         "⏳ Your payment is awaiting admin approval. Balance will update once approved.")
@@ -1412,24 +2393,19 @@ if st.session_state.user_type == "customer":
                 amount = max(0.0, current_balance) if current_balance > 0 else None
                 tn = f"Payment for {customer.get('customer_id', '')}"
                 
-                upi_url = f"upi://pay?pa={upi_id}&pn={company_name.replace(' ', '%20')}"
-                if amount:
-                    upi_url += f"&am={amount:.2f}"
-                upi_url += "&cu=INR"
-                if tn:
-                    upi_url += f"&tn={tn.replace(' ', '%20')}"
+                upi_url = build_upi_url(upi_id, company_name, amount, tn)
                 
 
 
                 if current_balance > 0:
-                    st.info(f"💰 **Recommended Payment:** {format_currency(current_balance)} (clears all dues)")
+                    st.info(f"💰 **Recommended Payment:** {balance_display} (clears all dues)")
 
             with col2:
                 if company.get('upi_id'):
                     try:
-                        qr_amount = max(0.0, current_balance) if current_balance > 0 else None
-                        qr_img_bytes = generate_qr_code(company.get('upi_id', ''), qr_amount, company.get('name', ''))
-                        if qr_img_bytes and qr_img_bytes.getvalue():
+                        # Same arguments as the dashboard QR, so this is a cache hit on the same entry
+                        qr_img_bytes = generate_qr_code_bytes(upi_id, amount, company_name)
+                        if qr_img_bytes:
                             st.image(qr_img_bytes, width=200,
                                      caption=f"Scan to pay via UPI")
                             st.markdown(f"""
@@ -1476,10 +2452,16 @@ elif st.session_state.user_type == "admin":
 
     # Admin stats overview
     customers = get_all_customers()
+    # Per-customer figures shared by every admin tab below; cached across reruns until the next save.
+    aggregates = _admin_aggregates((TODAY, _customer_data_version()))
+    balances = aggregates["balances"]
+    payment_summaries = aggregates["payment_summaries"]
+    item_quantities = aggregates["item_quantities"]
+    search_keys = aggregates["search_keys"]
+    customer_labels = aggregates["labels"]
     total_customers = len(customers)
-    total_dues = sum(max(0, calculate_customer_balance(c)) for c in customers)
-    pending_payments = sum(
-        len([p for p in c.get("payment_history", []) if p.get("status") == "pending"]) for c in customers)
+    total_dues = sum(max(0, balance) for balance in balances.values())
+    pending_payments = sum(len(summary.pending) for summary in payment_summaries.values())
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -1489,10 +2471,7 @@ elif st.session_state.user_type == "admin":
     with col3:
         st.metric("⏳ Pending Approvals", pending_payments)
     with col4:
-        active_rentals = sum(1 for c in customers if any(
-            sum(safe_float(tx.get("qty", 0)) for tx in c.get("transactions", []) if tx.get("item") == item) > 0
-            for item in set(tx.get("item") for tx in c.get("transactions", []))
-        ))
+        active_rentals = sum(1 for totals in item_quantities.values() if any(qty > 0 for qty in totals.values()))
         st.metric("🔄 Active Rentals", active_rentals)
 
     admin_tabs = st.tabs(["📊 Dashboard", "👥 Customers", "✅ Payment Approvals", "📈 Reports", "⚙️ Settings", "🔧 System"])
@@ -1506,15 +2485,17 @@ elif st.session_state.user_type == "admin":
 
             with col1:
                 # Top customers by outstanding balance
-                customer_balances = [(c.get('name'), calculate_customer_balance(c)) for c in customers]
+                customer_balances = [(c.get('name'), balances[c['customer_id']]) for c in customers]
                 customer_balances = [(name, balance) for name, balance in customer_balances if balance > 0]
                 customer_balances.sort(key=lambda x: x[1], reverse=True)
 
                 if customer_balances:
                     st.subheader("🔝 Top Outstanding Balances")
-                    top_customers_df = pd.DataFrame(customer_balances[:10], columns=["Customer", "Balance"])
-                    top_customers_df["Balance"] = top_customers_df["Balance"].apply(format_currency)
-                    st.dataframe(top_customers_df, hide_index=True, use_container_width=True)
+                    top_customers = {
+                        "Customer": [name for name, _ in customer_balances[:10]],
+                        "Balance": [format_currency(balance) for _, balance in customer_balances[:10]]
+                    }
+                    st.dataframe(top_customers, hide_index=True, use_container_width=True)
 
             with col2:
                 # Payment methods distribution
@@ -1529,24 +2510,23 @@ elif st.session_state.user_type == "admin":
                         method_counts[method] = method_counts.get(method, 0) + 1
 
                     st.subheader("💳 Payment Methods Distribution")
-                    fig = px.pie(values=list(method_counts.values()), names=list(method_counts.keys()))
-                    fig.update_layout(height=300)
+                    fig = _pie_chart(tuple(method_counts.values()), tuple(method_counts.keys()), height=300)
                     st.plotly_chart(fig, use_container_width=True)
 
             # Monthly revenue trend
             if all_payments:
                 st.subheader("📈 Monthly Revenue Trend")
-                payments_df = pd.DataFrame([
-                    {"Date": p.get("date"), "Amount": safe_float(p.get("amount", 0))}
-                    for p in all_payments
-                ])
-                payments_df["Date"] = pd.to_datetime(payments_df["Date"])
-                payments_df["Month"] = payments_df["Date"].dt.to_period("M")
-                monthly_revenue = payments_df.groupby("Month")["Amount"].sum().reset_index()
-                monthly_revenue["Month"] = monthly_revenue["Month"].astype(str)
+                payments_df = pd.DataFrame({
+                    "Date": pd.to_datetime([p.get("date") for p in all_payments], format="%Y-%m-%d",
+                                           errors="coerce", cache=True),
+                    "Amount": np.fromiter((p.get("amount", 0.0) for p in all_payments), dtype=np.float64,
+                                          count=len(all_payments))
+                })
+                payments_df["Month"] = payments_df["Date"].dt.strftime("%Y-%m")
+                monthly_revenue = payments_df.groupby("Month", sort=True, as_index=False)["Amount"].sum()
 
-                fig = px.bar(monthly_revenue, x="Month", y="Amount", title="Monthly Revenue")
-                fig.update_layout(height=400)
+                fig = _xy_chart("bar", monthly_revenue, x="Month", y="Amount", title="Monthly Revenue",
+                                layout={"height": 400})
                 st.plotly_chart(fig, use_container_width=True)
 
     with admin_tabs[1]:  # Enhanced Customers Management
@@ -1555,13 +2535,13 @@ elif st.session_state.user_type == "admin":
         # Customer overview metrics
         col1, col2, col3 = st.columns(3)
         with col1:
-            customers_with_dues = sum(1 for c in customers if calculate_customer_balance(c) > 0)
+            customers_with_dues = sum(1 for balance in balances.values() if balance > 0)
             st.metric("Customers with Dues", customers_with_dues)
         with col2:
-            avg_balance = sum(calculate_customer_balance(c) for c in customers) / len(customers) if customers else 0
+            avg_balance = sum(balances.values()) / len(customers) if customers else 0
             st.metric("Average Balance", format_currency(avg_balance))
         with col3:
-            customers_with_advance = sum(1 for c in customers if calculate_customer_balance(c) < 0)
+            customers_with_advance = sum(1 for balance in balances.values() if balance < 0)
             st.metric("Customers with Advance", customers_with_advance)
 
         # Enhanced Add Customer
@@ -1586,7 +2566,7 @@ elif st.session_state.user_type == "admin":
                         st.error("❌ Please enter a valid 10-digit mobile number.")
                     else:
                         if not cust_id:
-                            cust_id = f"CUST-{dt.date.today().strftime('%Y%m%d')}-{str(uuid.uuid4())[:4].upper()}"
+                            cust_id = f"CUST-{TODAY_STAMP}-{str(uuid.uuid4())[:4].upper()}"
 
                         # Check for duplicates
                         if any(c.get('customer_id') == cust_id for c in customers):
@@ -1626,11 +2606,10 @@ elif st.session_state.user_type == "admin":
 
             if uploaded_file is not None:
                 try:
-                    content = uploaded_file.getvalue().decode("utf-8").strip()
-                    if content.startswith("[") and content.endswith("]"):
-                        new_customers = json.loads(content)
-                    else:
-                        new_customers = json.loads("[" + content.rstrip(",") + "]")
+                    content = uploaded_file.getvalue().strip()
+                    if not (content.startswith(b"[") and content.endswith(b"]")):
+                        content = b"[" + content.rstrip(b",") + b"]"
+                    new_customers = _json_loads(content)
 
                     if not isinstance(new_customers, list):
                         st.error("❌ JSON must be an array of customer objects")
@@ -1640,6 +2619,7 @@ elif st.session_state.user_type == "admin":
                         existing_ids = {c['customer_id'] for c in existing_customers}
 
                         results = {"added": 0, "skipped": 0, "errors": []}
+                        staged_customers = []
 
                         progress_bar = st.progress(0)
                         status_text = st.empty()
@@ -1663,7 +2643,7 @@ elif st.session_state.user_type == "admin":
 
                                 customer_id = customer.get('customer_id')
                                 if not customer_id:
-                                    customer_id = f"CUST-{dt.date.today().strftime('%Y%m%d')}-{str(uuid.uuid4())[:4].upper()}"
+                                    customer_id = f"CUST-{TODAY_STAMP}-{str(uuid.uuid4())[:4].upper()}"
                                 elif customer_id in existing_ids:
                                     results["skipped"] += 1
                                     results["errors"].append(f"Duplicate ID: {customer_id}")
@@ -1682,16 +2662,21 @@ elif st.session_state.user_type == "admin":
                                     "created_at": dt.datetime.now().isoformat()
                                 }
 
-                                if save_customer_data(new_customer_data):
-                                    results["added"] += 1
-                                    existing_mobiles.add(mobile)
-                                    existing_ids.add(customer_id)
-                                else:
-                                    results["errors"].append(f"Failed to save: {customer_id}")
+                                staged_customers.append(new_customer_data)
+                                existing_mobiles.add(mobile)
+                                existing_ids.add(customer_id)
 
                             except Exception as e:
                                 results["errors"].append(f"Error processing customer {i + 1}: {str(e)}")
 
+                        status_text.text(f"Saving {len(staged_customers)} customers...")
+                        for new_customer_data, saved in zip(staged_customers,
+                                                            save_customers_bulk(staged_customers)):
+                            if saved:
+                                results["added"] += 1
+                            else:
+                                results["errors"].append(f"Failed to save: {new_customer_data['customer_id']}")
+
                         progress_bar.empty()
                         status_text.empty()
 
@@ -1729,67 +2714,52 @@ elif st.session_state.user_type == "admin":
         # Filter and sort customers
         filtered_customers = customers
         if search_term:
-            filtered_customers = [
-                c for c in customers
-                if search_term.lower() in c.get('name', '').lower()
-                   or search_term.lower() in c.get('customer_id', '').lower()
-                   or search_term in c.get('mobile', '')
-            ]
+            search_lower = search_term.lower()
+            filtered_customers = [c for c in customers if search_lower in search_keys[c['customer_id']]]
 
         if balance_filter != "All":
             if balance_filter == "Has Dues":
-                filtered_customers = [c for c in filtered_customers if calculate_customer_balance(c) > 0]
+                filtered_customers = [c for c in filtered_customers if balances[c['customer_id']] > 0]
             elif balance_filter == "Has Advance":
-                filtered_customers = [c for c in filtered_customers if calculate_customer_balance(c) < 0]
+                filtered_customers = [c for c in filtered_customers if balances[c['customer_id']] < 0]
             elif balance_filter == "Zero Balance":
-                filtered_customers = [c for c in filtered_customers if calculate_customer_balance(c) == 0]
+                filtered_customers = [c for c in filtered_customers if balances[c['customer_id']] == 0]
 
-        # Sort customers
+        # Sort customers on keys computed once per customer, then reorder by index
         if sort_by == "Balance":
-            filtered_customers.sort(key=lambda c: calculate_customer_balance(c), reverse=True)
+            sort_keys = [balances[c['customer_id']] for c in filtered_customers]
         elif sort_by == "Recent Activity":
-            filtered_customers.sort(key=lambda c: max(
-                [p.get('date', '1900-01-01') for p in c.get('payment_history', [])] or ['1900-01-01']), reverse=True)
+            # Payment histories are kept in date order, so the last entry is the most recent.
+            sort_keys = [(c.get('payment_history') or [{}])[-1].get('date', '1900-01-01') for c in filtered_customers]
         else:  # Name
-            filtered_customers.sort(key=lambda c: c.get('name', '').lower())
+            sort_keys = [c.get('name', '').lower() for c in filtered_customers]
+        order = sorted(range(len(filtered_customers)), key=sort_keys.__getitem__, reverse=sort_by != "Name")
+        filtered_customers = [filtered_customers[i] for i in order]
 
         # Display customers
         if filtered_customers:
-            customer_display_data = []
-            for cust in filtered_customers:
-                balance = calculate_customer_balance(cust)
-                last_payment = "Never"
-                payments = [p for p in cust.get("payment_history", []) if p.get("status") == "approved"]
-                if payments:
-                    latest = max(payments, key=lambda p: p.get("date", "1900-01-01"))
-                    last_payment = format_date(latest.get("date"))
-
-                customer_display_data.append({
-                    "ID": cust.get('customer_id'),
-                    "Name": cust.get('name'),
-                    "Mobile": cust.get('mobile'),
-                    "Balance": format_currency(balance),
-                    "Last Payment": last_payment,
-                    "Balance_raw": balance  # For sorting
-                })
-
-            df_customers = pd.DataFrame(customer_display_data)
-            st.dataframe(df_customers[["ID", "Name", "Mobile", "Balance", "Last Payment"]],
-                         use_container_width=True, hide_index=True, height=400)
+            customer_ids = [cust['customer_id'] for cust in filtered_customers]
+            last_payment_dates = [payment_summaries[cid].latest_approved_date for cid in customer_ids]
+            df_customers = pd.DataFrame({
+                "ID": customer_ids,
+                "Name": [cust.get('name') for cust in filtered_customers],
+                "Mobile": [cust.get('mobile') for cust in filtered_customers],
+                "Balance": [format_currency(balances[cid]) for cid in customer_ids],
+                "Last Payment": [format_date(d) if d is not None else "Never" for d in last_payment_dates]
+            }, copy=False)
+            st.dataframe(df_customers, use_container_width=True, hide_index=True, height=400)
         else:
             st.info("📋 No customers found matching your criteria.")
 
         # Enhanced Customer Details
         if filtered_customers:
             st.markdown("### 🔍 Customer Details & Management")
-            cust_options = {
-                f"{c.get('name')} ({c.get('customer_id')}) - {format_currency(calculate_customer_balance(c))}": c.get(
-                    'customer_id') for c in filtered_customers}
+            cust_options = {customer_labels[c['customer_id']]: c['customer_id'] for c in filtered_customers}
             selected_cust_display = st.selectbox("Select Customer for Detailed View", cust_options.keys(), index=None)
 
             if selected_cust_display:
                 selected_id = cust_options[selected_cust_display]
-                customer_data = next((c for c in customers if c.get("customer_id") == selected_id), None)
+                customer_data = next((c for c in filtered_customers if c['customer_id'] == selected_id), None)
 
                 if customer_data:
                     st.markdown(f"#### 👤 Managing: {customer_data['name']}")
@@ -1858,17 +2828,16 @@ elif st.session_state.user_type == "admin":
 
                         transactions = customer_data.get("transactions", [])
                         if transactions:
-                            tx_display = []
-                            for tx in sorted(transactions, key=lambda x: x.get("date", ""), reverse=True):
-                                action = "🔴 Return" if safe_float(tx.get("qty", 0)) < 0 else "🟢 Rent"
-                                tx_display.append({
-                                    "Date": format_date(tx.get("date")),
-                                    "Item": tx.get("item"),
-                                    "Action": action,
-                                    "Quantity": abs(int(safe_float(tx.get("qty", 0))))
-                                })
-                            st.dataframe(pd.DataFrame(tx_display), use_container_width=True, hide_index=True,
-                                         height=300)
+                            admin_tx_df = _transactions_frame(transactions)
+                            admin_tx_df = admin_tx_df.sort_values("date", ascending=False, kind="stable",
+                                                                  na_position="last")
+                            tx_display = pd.DataFrame({
+                                "Date": admin_tx_df["date"].map(format_date),
+                                "Item": admin_tx_df["item"],
+                                "Action": np.where(admin_tx_df["qty"] < 0, "🔴 Return", "🟢 Rent"),
+                                "Quantity": admin_tx_df["qty"].abs().astype(int)
+                            }, copy=False)
+                            st.dataframe(tx_display, use_container_width=True, hide_index=True, height=300)
                         else:
                             st.info("📋 No transactions recorded.")
 
@@ -1885,7 +2854,7 @@ elif st.session_state.user_type == "admin":
                             with col2:
                                 tx_qty = st.number_input("📦 Quantity", step=1, help="Positive: Rent, Negative: Return")
                             with col3:
-                                tx_date = st.date_input("📅 Date", dt.date.today())
+                                tx_date = st.date_input("📅 Date", TODAY)
 
                             if st.form_submit_button("📝 Record Transaction", type="primary"):
                                 if tx_item and tx_qty != 0:
@@ -1910,17 +2879,14 @@ elif st.session_state.user_type == "admin":
 
                         payment_history = customer_data.get("payment_history", [])
                         if payment_history:
-                            payment_display = []
-                            for p in sorted(payment_history, key=lambda x: x.get("date", ""), reverse=True):
-                                status_icon = {"approved": "✅", "pending": "⏳", "rejected": "❌"}.get(p.get("status"),
-                                                                                                     "❓")
-                                payment_display.append({
-                                    "Date": format_date(p.get("date")),
-                                    "Amount": format_currency(safe_float(p.get("amount", 0))),
-                                    "Method": p.get("method", "N/A"),
-                                    "Reference": p.get("reference", "N/A"),
-                                    "Status": f"{status_icon} {p.get('status', 'Unknown').title()}"
-                                })
+                            payment_display = [{
+                                "Date": format_date(p.get("date")),
+                                "Amount": format_currency(p.get("amount", 0.0)),
+                                "Method": p.get("method", "N/A"),
+                                "Reference": p.get("reference", "N/A"),
+                                "Status": f"{PAYMENT_STATUS_ICONS.get(p.get('status'), '❓')} "
+                                          f"{p.get('status', 'Unknown').title()}"
+                            } for p in reversed(payment_history)]
                             st.dataframe(pd.DataFrame(payment_display), use_container_width=True, hide_index=True,
                                          height=300)
                         else:
@@ -1937,7 +2903,7 @@ elif st.session_state.user_type == "admin":
                     all_pending.append({
                         "customer": cust,
                         "payment": p,
-                        "customer_balance": calculate_customer_balance(cust)
+                        "customer_balance": balances[cust["customer_id"]]
                     })
 
         if not all_pending:
@@ -1950,15 +2916,7 @@ elif st.session_state.user_type == "admin":
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("✅ Approve All Payments", type="primary", use_container_width=True):
-                    approved_count = 0
-                    for item in all_pending:
-                        payment = item['payment']
-                        customer = item['customer']
-                        payment['status'] = 'approved'
-                        payment['approved_by'] = 'admin'
-                        payment['approved_at'] = dt.datetime.now().isoformat()
-                        if save_customer_data(customer):
-                            approved_count += 1
+                    approved_count = set_pending_payments_status(all_pending, 'approved')
 
                     if approved_count > 0:
                         st.success(f"✅ Approved {approved_count} payments successfully!")
@@ -1967,15 +2925,7 @@ elif st.session_state.user_type == "admin":
             with col2:
                 if st.button("❌ Reject All Payments", use_container_width=True):
                     if st.session_state.get('confirm_reject_all', False):
-                        rejected_count = 0
-                        for item in all_pending:
-                            payment = item['payment']
-                            customer = item['customer']
-                            payment['status'] = 'rejected'
-                            payment['rejected_by'] = 'admin'
-                            payment['rejected_at'] = dt.datetime.now().isoformat()
-                            if save_customer_data(customer):
-                                rejected_count += 1
+                        rejected_count = set_pending_payments_status(all_pending, 'rejected')
 
                         if rejected_count > 0:
                             st.warning(f"❌ Rejected {rejected_count} payments")
@@ -1988,311 +2938,25 @@ elif st.session_state.user_type == "admin":
             st.markdown("---")
 
             # Individual payment approvals
-            for i, item in enumerate(all_pending):
-                customer = item['customer']
-                payment = item['payment']
-                balance = item['customer_balance']
-
-                with st.container(border=True):
-                    col1, col2, col3 = st.columns([3, 2, 2])
-
-                    with col1:
-                        st.markdown(f"**👤 {customer['name']}** (`{customer['customer_id']}`)")
-                        st.markdown(f"**💰 Amount:** {format_currency(safe_float(payment['amount']))}")
-                        st.markdown(f"**📅 Date:** {format_date(payment['date'])}")
-
-                    with col2:
-                        st.markdown(f"**💳 Method:** {payment.get('method', 'N/A')}")
-                        if payment.get('reference'):
-                            st.markdown(f"**🔖 Ref:** `{payment['reference']}`")
-                        st.markdown(f"**⚖️ Current Balance:** {format_currency(balance)}")
-
-                    with col3:
-                        # Calculate balance after payment
-                        balance_after = balance - safe_float(payment['amount'])
-                        if balance_after <= 0:
-                            st.success(f"✅ Will clear dues")
-                        else:
-                            st.info(f"📊 Remaining: {format_currency(balance_after)}")
-
-                        col3a, col3b = st.columns(2)
-                        with col3a:
-                            if st.button("✅", key=f"approve_{payment['id']}", use_container_width=True, type="primary"):
-                                payment['status'] = 'approved'
-                                payment['approved_by'] = 'admin'
-                                payment['approved_at'] = dt.datetime.now().isoformat()
-                                if save_customer_data(customer):
-                                    st.success(f"✅ Payment approved for {customer['name']}")
-                                    st.rerun()
-
-                        with col3b:
-                            if st.button("❌", key=f"reject_{payment['id']}", use_container_width=True):
-                                payment['status'] = 'rejected'
-                                payment['rejected_by'] = 'admin'
-                                payment['rejected_at'] = dt.datetime.now().isoformat()
-                                if save_customer_data(customer):
-                                    st.warning(f"❌ Payment rejected for {customer['name']}")
-                                    st.rerun()
-
-                    # Show notes if any
-                    if payment.get('notes'):
-                        st.markdown(f"**📝 Notes:** {payment['notes']}")
+            display_pending_approvals(all_pending)
 
     with admin_tabs[3]:  # Enhanced Reports
         st.subheader("📈 Business Reports & Analytics")
 
+        report_frames = _admin_report_frames((TODAY, _customer_data_version()))
         report_tabs = st.tabs(["💰 Financial", "👥 Customer Analytics", "📊 Transaction Reports", "📈 Trends"])
 
         with report_tabs[0]:  # Financial Reports
-            st.markdown("#### 💰 Financial Overview")
-
-            # Financial metrics
-            total_outstanding = sum(max(0, calculate_customer_balance(c)) for c in customers)
-            total_advances = sum(abs(min(0, calculate_customer_balance(c))) for c in customers)
-            total_received = sum(
-                sum(safe_float(p.get("amount", 0)) for p in c.get("payment_history", []) if
-                    p.get("status") == "approved")
-                for c in customers
-            )
-
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("💰 Total Outstanding", format_currency(total_outstanding))
-            with col2:
-                st.metric("💎 Total Advances", format_currency(total_advances))
-            with col3:
-                st.metric("📈 Total Received", format_currency(total_received))
-            with col4:
-                net_position = total_received - total_outstanding + total_advances
-                st.metric("🏦 Net Position", format_currency(net_position))
-
-            # Outstanding balances report
-            st.markdown("#### 📋 Outstanding Balances Report")
-            outstanding_customers = []
-            for c in customers:
-                balance = calculate_customer_balance(c)
-                if balance > 0:
-                    outstanding_customers.append({
-                        "Customer": c.get('name'),
-                        "ID": c.get('customer_id'),
-                        "Mobile": c.get('mobile'),
-                        "Outstanding": balance,
-                        "Days_Since_Last_Payment": (
-                                dt.date.today() -
-                                dt.datetime.strptime(
-                                    max([p.get('date', '1900-01-01') for p in c.get('payment_history', []) if
-                                         p.get('status') == 'approved'], default='1900-01-01'),
-                                    '%Y-%m-%d'
-                                ).date()
-                        ).days if any(p.get('status') == 'approved' for p in c.get('payment_history', [])) else 9999
-                    })
-
-            if outstanding_customers:
-                outstanding_df = pd.DataFrame(outstanding_customers)
-                outstanding_df['Outstanding_Formatted'] = outstanding_df['Outstanding'].apply(format_currency)
-                outstanding_df_display = outstanding_df[
-                    ['Customer', 'ID', 'Mobile', 'Outstanding_Formatted', 'Days_Since_Last_Payment']].copy()
-                outstanding_df_display.columns = ['Customer', 'ID', 'Mobile', 'Outstanding', 'Days Since Last Payment']
-
-                st.dataframe(outstanding_df_display, use_container_width=True, hide_index=True)
-
-                # Export option
-                csv_data = outstanding_df_display.to_csv(index=False)
-                st.download_button(
-                    "📥 Download Outstanding Report (CSV)",
-                    csv_data,
-                    f"outstanding_report_{dt.date.today().strftime('%Y%m%d')}.csv",
-                    "text/csv",
-                    use_container_width=True
-                )
-            else:
-                st.success("🎉 No outstanding balances! All customers are up to date.")
+            display_financial_report(customers, balances, payment_summaries)
 
         with report_tabs[1]:  # Customer Analytics
-            st.markdown("#### 👥 Customer Analytics")
-
-            if customers:
-                # Customer distribution charts
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # Balance distribution
-                    balance_categories = {"Dues": 0, "Clear": 0, "Advance": 0}
-                    for c in customers:
-                        balance = calculate_customer_balance(c)
-                        if balance > 0:
-                            balance_categories["Dues"] += 1
-                        elif balance < 0:
-                            balance_categories["Advance"] += 1
-                        else:
-                            balance_categories["Clear"] += 1
-
-                    fig_balance = px.pie(
-                        values=list(balance_categories.values()),
-                        names=list(balance_categories.keys()),
-                        title="Customer Balance Distribution"
-                    )
-                    st.plotly_chart(fig_balance, use_container_width=True)
-
-                with col2:
-                    # Activity distribution
-                    active_customers = sum(1 for c in customers if c.get('transactions'))
-                    inactive_customers = len(customers) - active_customers
-
-                    fig_activity = px.pie(
-                        values=[active_customers, inactive_customers],
-                        names=["Active", "Inactive"],
-                        title="Customer Activity Status"
-                    )
-                    st.plotly_chart(fig_activity, use_container_width=True)
-
-                # Top customers analysis
-                st.markdown("#### 🏆 Top Customers Analysis")
-
-                customer_stats = []
-                for c in customers:
-                    total_paid = sum(safe_float(p.get("amount", 0)) for p in c.get("payment_history", []) if
-                                     p.get("status") == "approved")
-                    total_transactions = len(c.get("transactions", []))
-                    current_balance = calculate_customer_balance(c)
-
-                    customer_stats.append({
-                        "Name": c.get('name'),
-                        "ID": c.get('customer_id'),
-                        "Total_Paid": total_paid,
-                        "Transactions": total_transactions,
-                        "Current_Balance": current_balance
-                    })
-
-                # Top by payments
-                top_payers = sorted(customer_stats, key=lambda x: x['Total_Paid'], reverse=True)[:10]
-                if top_payers:
-                    st.markdown("##### 💰 Top 10 Customers by Total Payments")
-                    top_payers_df = pd.DataFrame(top_payers)
-                    top_payers_df['Total_Paid_Formatted'] = top_payers_df['Total_Paid'].apply(format_currency)
-                    st.dataframe(
-                        top_payers_df[['Name', 'ID', 'Total_Paid_Formatted', 'Transactions']].rename(columns={
-                            'Total_Paid_Formatted': 'Total Paid',
-                            'Transactions': 'Total Transactions'
-                        }),
-                        use_container_width=True,
-                        hide_index=True
-                    )
+            display_customer_analytics(customers, balances, payment_summaries)
 
         with report_tabs[2]:  # Transaction Reports
-            st.markdown("#### 📊 Transaction Analysis")
-
-            # Collect all transactions
-            all_transactions = []
-            for c in customers:
-                for tx in c.get("transactions", []):
-                    all_transactions.append({
-                        "Customer": c.get('name'),
-                        "Customer_ID": c.get('customer_id'),
-                        "Date": tx.get('date'),
-                        "Item": tx.get('item'),
-                        "Quantity": safe_float(tx.get('qty', 0)),
-                        "Action": "Rent" if safe_float(tx.get('qty', 0)) > 0 else "Return"
-                    })
-
-            if all_transactions:
-                transactions_df = pd.DataFrame(all_transactions)
-                transactions_df['Date'] = pd.to_datetime(transactions_df['Date'])
-
-                # Transaction volume over time
-                st.markdown("##### 📈 Transaction Volume Trend")
-                daily_transactions = transactions_df.groupby(transactions_df['Date'].dt.date).size().reset_index(
-                    name='Count')
-                daily_transactions['Date'] = pd.to_datetime(daily_transactions['Date'])
-
-                fig_volume = px.line(daily_transactions, x='Date', y='Count', title='Daily Transaction Volume')
-                st.plotly_chart(fig_volume, use_container_width=True)
-
-                # Most popular items
-                st.markdown("##### 🏗️ Most Popular Items")
-                item_activity = transactions_df.groupby('Item').agg({
-                    'Quantity': ['sum', 'count']
-                }).round(2)
-                item_activity.columns = ['Total_Quantity', 'Transaction_Count']
-                item_activity = item_activity.reset_index().sort_values('Transaction_Count', ascending=False)
-
-                if not item_activity.empty:
-                    st.dataframe(
-                        item_activity.rename(columns={
-                            'Item': 'Item Name',
-                            'Total_Quantity': 'Net Quantity',
-                            'Transaction_Count': 'Total Transactions'
-                        }),
-                        use_container_width=True,
-                        hide_index=True
-                    )
-
-                # Recent activity
-                st.markdown("##### 🕒 Recent Transaction Activity")
-                recent_transactions = transactions_df.sort_values('Date', ascending=False).head(20)
-                recent_display = recent_transactions.copy()
-                recent_display['Date'] = recent_display['Date'].dt.strftime('%Y-%m-%d')
-                recent_display['Quantity'] = recent_display['Quantity'].abs().astype(int)
-
-                st.dataframe(
-                    recent_display[['Date', 'Customer', 'Item', 'Action', 'Quantity']],
-                    use_container_width=True,
-                    hide_index=True
-                )
-            else:
-                st.info("📋 No transaction data available for analysis.")
+            display_transaction_report(report_frames["transactions"], report_frames["item_activity"])
 
         with report_tabs[3]:  # Trends
-            st.markdown("#### 📈 Business Trends")
-
-            # Payment trends
-            all_payments = []
-            for c in customers:
-                for p in c.get("payment_history", []):
-                    if p.get("status") == "approved":
-                        all_payments.append({
-                            "Date": p.get('date'),
-                            "Amount": safe_float(p.get('amount', 0)),
-                            "Method": p.get('method', 'Unknown')
-                        })
-
-            if all_payments:
-                payments_df = pd.DataFrame(all_payments)
-                payments_df['Date'] = pd.to_datetime(payments_df['Date'])
-
-                # Monthly revenue trend
-                st.markdown("##### 💰 Monthly Revenue Trend")
-                monthly_revenue = payments_df.groupby(payments_df['Date'].dt.to_period('M'))[
-                    'Amount'].sum().reset_index()
-                monthly_revenue['Date'] = monthly_revenue['Date'].astype(str)
-
-                fig_revenue = px.bar(monthly_revenue, x='Date', y='Amount', title='Monthly Revenue')
-                fig_revenue.update_layout(xaxis_title="Month", yaxis_title="Revenue (₹)")
-                st.plotly_chart(fig_revenue, use_container_width=True)
-
-                # Payment method trends
-                st.markdown("##### 💳 Payment Method Preferences")
-                method_trends = payments_df['Method'].value_counts().reset_index()
-                method_trends.columns = ['Method', 'Count']
-
-                fig_methods = px.bar(method_trends, x='Method', y='Count', title='Payment Methods Usage')
-                st.plotly_chart(fig_methods, use_container_width=True)
-
-                # Growth metrics
-                if len(monthly_revenue) > 1:
-                    current_month = monthly_revenue.iloc[-1]['Amount']
-                    previous_month = monthly_revenue.iloc[-2]['Amount'] if len(monthly_revenue) > 1 else 0
-                    growth_rate = ((current_month - previous_month) / previous_month * 100) if previous_month > 0 else 0
-
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("This Month", format_currency(current_month))
-                    with col2:
-                        st.metric("Last Month", format_currency(previous_month))
-                    with col3:
-                        st.metric("Growth Rate", f"{growth_rate:.1f}%", delta=f"{growth_rate:.1f}%")
-            else:
-                st.info("📊 No payment data available for trend analysis.")
+            display_trends_report(report_frames["payments"])
 
     with admin_tabs[4]:  # Enhanced Settings
         st.subheader("⚙️ System Configuration")
@@ -2349,7 +3013,7 @@ elif st.session_state.user_type == "admin":
 
                     if not current_password:
                         st.error("❌ Current password is required.")
-                    elif hash_password(current_password) != settings.get("admin_password_hash"):
+                    elif not verify_password(current_password, settings.get("admin_password_hash")):
                         st.error("❌ Current password is incorrect.")
                     elif len(new_password) < 6:
                         st.error("❌ New password must be at least 6 characters long.")
@@ -2414,9 +3078,10 @@ elif st.session_state.user_type == "admin":
     with admin_tabs[5]:  # Enhanced System
         st.subheader("🔧 System Management")
 
-        system_tabs = st.tabs(["🧹 Maintenance", "📊 System Stats", "🔄 Data Management", "🆘 Support"])
+        # A radio instead of st.tabs so only the selected section's body runs on each rerun
+        system_section = st.radio("System section", SYSTEM_SECTIONS, horizontal=True, label_visibility="collapsed")
 
-        with system_tabs[0]:  # Maintenance
+        if system_section == SYSTEM_SECTIONS[0]:  # Maintenance
             st.markdown("#### 🧹 System Maintenance")
 
             col1, col2 = st.columns(2)
@@ -2442,22 +3107,27 @@ elif st.session_state.user_type == "admin":
                         issues = []
                         customers = get_all_customers()
 
-                        for c in customers:
+                        # Check mobile formats and transaction dates in one vectorized pass each
+                        mobiles = pd.Series([str(c.get('mobile') or '') for c in customers], dtype=object)
+                        bad_mobiles = ((mobiles != '') & ~mobiles.str.fullmatch(r'\d{10}')).to_numpy()
+                        tx_dates = pd.Series([tx.get('date', '') for c in customers for tx in c.get('transactions', [])],
+                                             dtype=object)
+                        bad_dates = pd.to_datetime(tx_dates, format='%Y-%m-%d', errors='coerce').isna().to_numpy()
+
+                        tx_pos = 0
+                        for i, c in enumerate(customers):
                             # Check required fields
                             if not all(c.get(field) for field in ['customer_id', 'name', 'mobile']):
                                 issues.append(f"Missing required fields: {c.get('customer_id', 'Unknown')}")
 
-                            # Check mobile format
-                            mobile = c.get('mobile', '')
-                            if mobile and (len(mobile) != 10 or not mobile.isdigit()):
-                                issues.append(f"Invalid mobile format: {c.get('name', 'Unknown')} - {mobile}")
+                            if bad_mobiles[i]:
+                                issues.append(f"Invalid mobile format: {c.get('name', 'Unknown')} - {c.get('mobile')}")
 
                             # Check transaction data integrity
-                            for tx in c.get('transactions', []):
-                                try:
-                                    dt.datetime.strptime(tx.get('date', ''), '%Y-%m-%d')
-                                except ValueError:
-                                    issues.append(f"Invalid date in transaction: {c.get('name', 'Unknown')}")
+                            tx_count = len(c.get('transactions', []))
+                            issues.extend([f"Invalid date in transaction: {c.get('name', 'Unknown')}"]
+                                          * int(bad_dates[tx_pos:tx_pos + tx_count].sum()))
+                            tx_pos += tx_count
 
                         if issues:
                             st.warning(f"⚠️ Found {len(issues)} data issues:")
@@ -2468,16 +3138,12 @@ elif st.session_state.user_type == "admin":
                         else:
                             st.success("✅ All customer data is valid!")
 
-        with system_tabs[1]:  # System Stats
+        elif system_section == SYSTEM_SECTIONS[1]:  # System Stats
             st.markdown("#### 📊 System Statistics")
 
             # File system stats
-            import os
-
-            data_dir_size = sum(os.path.getsize(os.path.join("data", f)) for f in os.listdir("data") if
-                                f.endswith('.json')) if os.path.exists("data") else 0
-            session_count = len([f for f in os.listdir("sessions") if f.endswith('.json')]) if os.path.exists(
-                "sessions") else 0
+            data_dir_size = json_dir_stats("data")[1]
+            session_count = json_dir_stats("sessions")[0]
 
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -2503,26 +3169,22 @@ elif st.session_state.user_type == "admin":
                 status_icon = "✅" if status else "❌"
                 st.write(f"{status_icon} {check}")
 
-        with system_tabs[2]:  # Data Management
+        elif system_section == SYSTEM_SECTIONS[2]:  # Data Management
             st.markdown("#### 🔄 Data Management")
 
             st.markdown("##### 📤 Export Data")
-            col1, col2 = st.columns(2)
+            data_version = (TODAY, _customer_data_version())
+            include_internal = st.checkbox("Include internal cache fields in customer exports", value=False,
+                                           help="Balance checkpoints are rebuilt on save, so backups can omit them.")
+            col1, col2, col3 = st.columns(3)
 
             with col1:
                 if st.button("📥 Export All Customer Data (JSON)", use_container_width=True):
                     try:
-                        export_data = {
-                            "export_date": dt.datetime.now().isoformat(),
-                            "total_customers": len(customers),
-                            "customers": customers
-                        }
-
-                        json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
                         st.download_button(
                             "📥 Download Customer Data",
-                            json_str,
-                            f"customer_data_export_{dt.date.today().strftime('%Y%m%d')}.json",
+                            _customer_json_export(data_version, include_internal),
+                            f"customer_data_export_{TODAY_STAMP}.json",
                             "application/json",
                             use_container_width=True
                         )
@@ -2532,31 +3194,33 @@ elif st.session_state.user_type == "admin":
             with col2:
                 if st.button("📊 Export Financial Summary (CSV)", use_container_width=True):
                     try:
-                        financial_data = []
-                        for c in customers:
-                            balance = calculate_customer_balance(c)
-                            total_paid = sum(safe_float(p.get("amount", 0)) for p in c.get("payment_history", []) if
-                                             p.get("status") == "approved")
-
-                            financial_data.append({
-                                "Customer_ID": c.get('customer_id'),
-                                "Name": c.get('name'),
-                                "Mobile": c.get('mobile'),
-                                "Current_Balance": balance,
-                                "Total_Paid": total_paid,
-                                "Previous_Balance": safe_float(c.get('previous_balance', 0)),
-                                "Status": "Dues" if balance > 0 else ("Advance" if balance < 0 else "Clear")
-                            })
-
-                        df = pd.DataFrame(financial_data)
-                        csv_str = df.to_csv(index=False)
                         st.download_button(
                             "📥 Download Financial Summary",
-                            csv_str,
-                            f"financial_summary_{dt.date.today().strftime('%Y%m%d')}.csv",
+                            _financial_summary_csv(data_version),
+                            f"financial_summary_{TODAY_STAMP}.csv",
                             "text/csv",
                             use_container_width=True
                         )
+                        st.download_button(
+                            "📥 Download Financial Summary (Parquet)",
+                            _financial_summary_parquet(data_version),
+                            f"financial_summary_{TODAY_STAMP}.parquet",
+                            "application/octet-stream",
+                            use_container_width=True
+                        )
+                    except Exception as e:
+                        st.error(f"Export failed: {str(e)}")
+
+            with col3:
+                if st.button("📥 Export Customer Data (NDJSON)", use_container_width=True):
+                    try:
+                        st.download_button(
+                            "📥 Download Customer Data (NDJSON)",
+                            _customer_ndjson_export(data_version, include_internal),
+                            f"customer_data_export_{TODAY_STAMP}.ndjson",
+                            "application/x-ndjson",
+                            use_container_width=True
+                        )
                     except Exception as e:
                         st.error(f"Export failed: {str(e)}")
 
@@ -2564,46 +3228,29 @@ elif st.session_state.user_type == "admin":
             with st.expander("🚨 Advanced Data Operations", expanded=False):
                 st.warning("⚠️ These operations are irreversible. Use with extreme caution!")
 
-                if st.button("🗑️ Clear All Session Data", type="secondary"):
-                    if st.session_state.get('confirm_clear_sessions', False):
+                with st.form("clear_sessions_form"):
+                    confirm_clear = st.checkbox("I understand this logs out every user and cannot be undone")
+                    clear_sessions = st.form_submit_button("🗑️ Clear All Session Data", type="secondary")
+
+                if clear_sessions:
+                    if confirm_clear:
                         try:
                             if os.path.exists("sessions"):
-                                for f in os.listdir("sessions"):
-                                    if f.endswith('.json'):
-                                        os.remove(os.path.join("sessions", f))
+                                with os.scandir("sessions") as entries:
+                                    for entry in entries:
+                                        if entry.name.endswith('.json') and entry.is_file():
+                                            os.unlink(entry.path)
+                            json_dir_stats.clear()
                             st.success("✅ All session data cleared.")
-                            st.session_state.confirm_clear_sessions = False
                         except Exception as e:
                             st.error(f"Error clearing sessions: {str(e)}")
                     else:
-                        st.session_state.confirm_clear_sessions = True
-                        st.warning("Click again to confirm clearing all sessions.")
+                        st.warning("Tick the confirmation box to clear all sessions.")
 
-        with system_tabs[3]:  # Support 
+        elif system_section == SYSTEM_SECTIONS[3]:  # Support 
             st.markdown("#### 🆘 Support Information")
 
-            st.markdown(f"""
-            **📋 System Information:**
-            - Application Version: 2.0.0 Enhanced
-            - Python Version: 3.8+
-            - Streamlit Version: Latest
-            - Last Updated: {dt.date.today().strftime('%B %Y')}
-
-            **🔧 Technical Support:**
-            - For technical issues, please contact your system administrator
-            - Check logs directory for detailed error information
-            - Ensure all required directories have proper permissions
-
-            **📚 User Guide:**
-            - Customer Portal: Login → View balance, history, make payments
-            - Admin Panel: Manage customers, approve payments, generate reports
-            - System maintains automatic backups of all data
-
-            **🚨 Emergency Procedures:**
-            - In case of data corruption, check the data directory
-            - Sessions can be safely cleared without data loss
-            - Settings can be reset to defaults if needed
-            """)
+            st.markdown(SUPPORT_INFO_MD.format(TODAY.strftime('%B %Y')))
     if st.button("🚪 Logout", use_container_width=True, type="secondary", key=4641):
             if st.session_state.session_id and delete_session(st.session_state.session_id):
                 st.session_state.session_id = None
@@ -2637,15 +3284,7 @@ else:
                 identifier = st.text_input("Mobile Number or Customer ID",
                                            placeholder="E.g., 9876543210 or CUST-001").strip()
                 if identifier != '123654':
-                    hide_st_style = """
-                    <style>
-                    MainMenu {visibility: hidden;}
-                    headerNoPadding {visibility: hidden;}
-                    _terminalButton_rix23_138 {visibility: hidden;}
-                    header {visibility: hidden;}
-                    </style>
-                    """
-                    st.markdown(hide_st_style, unsafe_allow_html=True)
+                    st.markdown(HIDE_STREAMLIT_STYLE, unsafe_allow_html=True)
                 login_button = st.form_submit_button("🚀 Login", use_container_width=True, type="primary")
 
             if login_button:
@@ -2678,87 +3317,12 @@ else:
     st.markdown("---")
     st.markdown("### 🎯 How It Works")
 
-    # Define colors for each card (you can customize these)
-    colors = {
-        "background": ["#FFEEEE", "#EEFFEE", "#EEEEFF", "#FFF5EE"],
-        "border": ["#FF6B6B", "#4CAF50", "#4285F4", "#FFA726"],
-        "text": ["#D32F2F", "#2E7D32", "#1565C0", "#E65100"]
-    }
-
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown(f"""
-        <div style="
-            background-color: {colors['background'][0]};
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid {colors['border'][0]};
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            margin: 10px 0;
-            transition: transform 0.2s;
-        ">
-            <h4 style="color: {colors['text'][0]}; margin-top: 0;">1️⃣ Register or login</h4>
-            <p style="color: #555555;">Get your customer account set up with our team</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div style="
-            background-color: {colors['background'][1]};
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid {colors['border'][1]};
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            margin: 10px 0;
-        ">
-            <h4 style="color: {colors['text'][1]}; margin-top: 0;">2️⃣ Rent Equipment</h4>
-            <p style="color: #555555;">Choose from our wide range of quality shuttering materials</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div style="
-            background-color: {colors['background'][2]};
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid {colors['border'][2]};
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            margin: 10px 0;
-        ">
-            <h4 style="color: {colors['text'][2]}; margin-top: 0;">3️⃣ Track Usage</h4>
-            <p style="color: #555555;">Monitor your rentals and payments through our digital portal</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col4:
-        st.markdown(f"""
-        <div style="
-            background-color: {colors['background'][3]};
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid {colors['border'][3]};
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            margin: 10px 0;
-        ">
-            <h4 style="color: {colors['text'][3]}; margin-top: 0;">4️⃣ Easy Payments</h4>
-            <p style="color: #555555;">Pay online via UPI, bank transfer, or traditional methods</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(HOW_IT_WORKS_HTML, unsafe_allow_html=True)
     # Call to action
     st.markdown("---")
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.markdown("""
-        <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 10px;">
-            <h3>Ready to Get Started?</h3>
-            <p style="margin-bottom: 1.5rem;">Join hundreds of satisfied customers who trust us with their construction needs.</p>
-            <p><strong>📞 Call us at {}</strong></p>
-            <p>or use the sidebar to access your existing account</p>
-        </div>
-        """.format(company.get('mobile', 'Contact Admin')), unsafe_allow_html=True)
+        st.markdown(CALL_TO_ACTION_HTML.format(company.get('mobile', 'Contact Admin')), unsafe_allow_html=True)
 with st.sidebar:
     st.markdown("---")
 
@@ -2777,7 +3341,7 @@ with st.sidebar:
             if admin_login_button:
                 if not admin_password_input:
                     st.error("Please enter the admin password.")
-                elif hash_password(admin_password_input) == company["admin_password_hash"]:
+                elif verify_password(admin_password_input, company["admin_password_hash"]):
                     session_id = create_session("admin", "admin")
                     if session_id:
                         st.session_state.session_id = session_id
@@ -2801,7 +3365,7 @@ with st.sidebar:
 
             # Quick balance display
             try:
-                balance = calculate_customer_balance(st.session_state.user_data)
+                balance = customer_balance
                 if balance > 0:
                     st.error(f"💰 Due: {format_currency(balance)}")
                 elif balance < 0:
@@ -2827,10 +3391,5 @@ with st.sidebar:
 
 # Footer
 st.markdown("---")
-st.markdown(f"""
-<div style="text-align: center; padding: 1rem; color: #7F8C8D; font-size: 0.9em;">
-    <p>© {dt.date.today().year} {company.get('name', 'Rental Management System')} | 
-    created by Sahil Jammu | Beta Version 1.0.0 </p>
-    <p>🏗️ Professional Rental Management Solutions</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML.format(TODAY.year, company.get('name', 'Rental Management System')),
+            unsafe_allow_html=True)